@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial, reduce
+from itertools import chain
 from typing import TypeVar, Callable, Optional, Iterator, Iterable, Sequence, ParamSpec
 
+from common import grouping, numeric
+
 T = ParamSpec('T')
 R = TypeVar('R')
 K = TypeVar('K')
@@ -44,6 +51,14 @@ class KList(list[T]):
                 ret_dict[key] = KList(x)
         return ret_dict
 
+    # Aggregates each group as it goes instead of building a list per key; see `common.grouping`.
+    def group_reduce(self, key_selector: Callable[[T], K], value_selector: Callable[[T], V],
+                     combine: Callable[[V, V], V]) -> dict[K, V]:
+        return grouping.group_reduce(self, key_selector, value_selector, combine)
+
+    def count_by(self, key_selector: Callable[[T], K]) -> dict[K, int]:
+        return grouping.count_by(self, key_selector)
+
     def size(self) -> int:
         return len(self)
 
@@ -80,6 +95,21 @@ class KList(list[T]):
             acc = operation(acc, x)
         return acc
 
+    def sum(self) -> float | int:
+        return sum(self)
+
+    def average(self) -> float:
+        return numeric.mean(self) if self else math.nan
+
+    def variance(self) -> float:
+        return numeric.variance(self) if self else math.nan
+
+    def min(self) -> T:
+        return min(self)
+
+    def max(self) -> T:
+        return max(self)
+
     def fold_right(self, initial: R, operation: Callable[[T, R], R]) -> R:
         acc = initial
         for x in self.reversed():
@@ -144,6 +174,61 @@ class KList(list[T]):
             associates[key] = value
         return associates
 
+    # Parallel variants. The list is split into `chunks` contiguous slices (one per CPU by default) which run on
+    # `executor` (a new `ProcessPoolExecutor` by default), and the results are merged back in order. With a process pool
+    # the functions and elements must be picklable, so not lambdas; pass a `ThreadPoolExecutor` for work that releases
+    # the GIL, such as I/O.
+    def par_map(self, transform: Callable[[T], R], executor: Optional[Executor] = None,
+                chunks: Optional[int] = None) -> KList[R]:
+        return _concat(_run_chunks(self, partial(_map_chunk, transform), executor, chunks))
+
+    def par_filter(self, predicate: Callable[[T], bool], executor: Optional[Executor] = None,
+                   chunks: Optional[int] = None) -> KList[T]:
+        return _concat(_run_chunks(self, partial(_filter_chunk, predicate), executor, chunks))
+
+    def par_flat_map(self, transform: Callable[[T], Iterable[R]], executor: Optional[Executor] = None,
+                     chunks: Optional[int] = None) -> KList[R]:
+        return _concat(_run_chunks(self, partial(_flat_map_chunk, transform), executor, chunks))
+
+    # Each chunk is folded starting from `initial`, and the partial results are merged with `combine`, so `initial`
+    # must be an identity for `combine` and `combine` must be associative.
+    def par_fold(self, initial: R, operation: Callable[[R, T], R], combine: Callable[[R, R], R],
+                 executor: Optional[Executor] = None, chunks: Optional[int] = None) -> R:
+        return reduce(combine, _run_chunks(self, partial(_fold_chunk, initial, operation), executor, chunks), initial)
+
+
+def _run_chunks(xs: list[T], work: Callable[[list[T]], R], executor: Optional[Executor],
+                chunks: Optional[int]) -> list[R]:
+    n = max(1, chunks or os.cpu_count() or 1)
+    size = max(1, -(-len(xs) // n))
+    parts = [xs[i:i + size] for i in range(0, len(xs), size)]
+    if executor is None:
+        with ProcessPoolExecutor() as pool:
+            return list(pool.map(work, parts))
+    return list(executor.map(work, parts))
+
+
+def _concat(parts: list[list[R]]) -> KList[R]:
+    ret_list = KList()
+    ret_list.extend(chain.from_iterable(parts))
+    return ret_list
+
+
+def _map_chunk(transform: Callable[[T], R], chunk: list[T]) -> list[R]:
+    return list(map(transform, chunk))
+
+
+def _filter_chunk(predicate: Callable[[T], bool], chunk: list[T]) -> list[T]:
+    return list(filter(predicate, chunk))
+
+
+def _flat_map_chunk(transform: Callable[[T], Iterable[R]], chunk: list[T]) -> list[R]:
+    return list(chain.from_iterable(map(transform, chunk)))
+
+
+def _fold_chunk(initial: R, operation: Callable[[R, T], R], chunk: list[T]) -> R:
+    return reduce(operation, chunk, initial)
+
 
 def also(a: T, f: Callable[[T], None]) -> T:
     f(a)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
-from functools import reduce
-from itertools import groupby
+from typing import Iterable, Optional
+
+from common.batching import merge_batches
 
 
 @dataclass(frozen=True)
@@ -39,12 +41,49 @@ def buy_coffee(cc: CreditCard) -> (Coffee, Charge):
     return cup, Charge(cc, cup.price)
 
 
+# Buying `n` coffees is the same as `buy_coffee` `n` times with the charges combined, but there's no need to build `n`
+# purchases to find that out.
 def buy_coffees(cc: CreditCard, n: int) -> (list[Coffee], Charge):
-    purchases = [buy_coffee(cc)] * n
-    coffees, charges = zip(*purchases)
-    return list(coffees), reduce((lambda c1, c2: c1.combine(c2)), charges)
+    cup = Coffee()
+    return [cup] * n, Charge(cc, cup.price * n)
+
+
+# Sums the amounts charged to each card in a dictionary, so charges to the same card don't need to be next to each
+# other, and only one `Charge` per card is created at the end. Cards are kept in the order they were first seen.
+# Charges can be added a few at a time, for example from a stream that is too big to hold in memory.
+class ChargeCoalescer:
+    def __init__(self) -> None:
+        self._totals: dict[CreditCard, float] = {}
+
+    def add(self, charge: Charge) -> ChargeCoalescer:
+        self._totals[charge.cc] = self._totals.get(charge.cc, 0.0) + charge.amount
+        return self
+
+    def extend(self, charges: Iterable[Charge]) -> ChargeCoalescer:
+        totals = self._totals
+        for charge in charges:
+            totals[charge.cc] = totals.get(charge.cc, 0.0) + charge.amount
+        return self
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    def charges(self) -> list[Charge]:
+        return [Charge(cc, amount) for cc, amount in self._totals.items()]
+
+
+def coalesce(charges: Iterable[Charge]) -> list[Charge]:
+    return ChargeCoalescer().extend(charges).charges()
 
 
-def coalesce(charges: list[Charge]) -> list[Charge]:
-    return [reduce((lambda c1, c2: c1.combine(c2)), x) for x in
-            [list(chgs) for credit_card, chgs in groupby(charges, lambda charge: charge.cc)]]
+# Coalesces `charges` in batches of `batch_size` on `executor` (a new `ProcessPoolExecutor` by default), then coalesces
+# the partial results, which have at most one charge per card per batch. Cards must be picklable for a process pool.
+# Batches are read from `charges` only as workers become free (see `merge_batches`).
+def coalesce_sharded(charges: Iterable[Charge], batch_size: int = 100_000,
+                     executor: Optional[Executor] = None) -> list[Charge]:
+    if executor is None:
+        with ProcessPoolExecutor() as pool:
+            return coalesce_sharded(charges, batch_size, pool)
+    totals = ChargeCoalescer()
+    merge_batches(charges, coalesce, totals.extend, batch_size, executor)
+    return totals.charges()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterable, Iterable, Optional
+
+from chapter01.cafe import Charge, ChargeCoalescer, Payments
+
+
+# Settles a stream of charges in windows instead of one payment per charge. Charges are coalesced per card until the
+# window holds `window_size` charges or `window_time` seconds have passed since its first charge, and then each card
+# is charged once for the window. `Payments.charge` is blocking, so a window is settled on a worker thread.
+#
+# `submit` waits while `max_pending` charges are queued, which slows producers down to the rate the payments backend
+# can keep up with instead of buffering without bound.
+#
+#   async with SettlementPipeline(payments) as pipeline:
+#       for charge in charges:
+#           await pipeline.submit(charge)
+class SettlementPipeline:
+    def __init__(self, payments: Payments, window_size: int = 1000, window_time: float = 1.0,
+                 max_pending: int = 10_000) -> None:
+        self._payments = payments
+        self._window_size = window_size
+        self._window_time = window_time
+        self._queue: asyncio.Queue[Optional[Charge]] = asyncio.Queue(max_pending)
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._closed = False
+
+    async def __aenter__(self) -> SettlementPipeline:
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def submit(self, charge: Charge) -> None:
+        self._check_started()
+        if self._closed:
+            raise RuntimeError('submit to a closed settlement pipeline')
+        await self._put(charge)
+
+    # Settles whatever is still queued and waits for the last window to be charged. If settling a window failed, the
+    # error is raised here (and by any `submit` after it).
+    async def close(self) -> None:
+        self._check_started()
+        if not self._closed:
+            self._closed = True
+            if not self._worker.done():
+                await self._put(None)
+        await self._worker
+
+    def _check_started(self) -> None:
+        if self._worker is None:
+            raise RuntimeError('settlement pipeline has not been started')
+
+    # Waits for room in the queue, but also for the worker: if settling fails while the queue is full, nothing would
+    # ever take from it again, so the worker's error is raised instead of waiting forever.
+    async def _put(self, item: Optional[Charge]) -> None:
+        if self._worker.done():
+            self._worker.result()
+            raise RuntimeError('settlement pipeline has stopped')
+        if not self._queue.full():
+            self._queue.put_nowait(item)
+            return
+        put = asyncio.ensure_future(self._queue.put(item))
+        await asyncio.wait((put, self._worker), return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            self._worker.result()
+            raise RuntimeError('settlement pipeline has stopped')
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        window = ChargeCoalescer()
+        count = 0
+        deadline = 0.0
+        while True:
+            try:
+                charge = await asyncio.wait_for(queue.get(), max(0.0, deadline - loop.time()) if count else None)
+            except asyncio.TimeoutError:
+                await self._settle(window)
+                window, count = ChargeCoalescer(), 0
+                continue
+            if charge is None:
+                break
+            if not count:
+                deadline = loop.time() + self._window_time
+            window.add(charge)
+            count += 1
+            while count < self._window_size and not queue.empty():
+                charge = queue.get_nowait()
+                if charge is None:
+                    await self._settle(window)
+                    return
+                window.add(charge)
+                count += 1
+            if count >= self._window_size:
+                await self._settle(window)
+                window, count = ChargeCoalescer(), 0
+        if count:
+            await self._settle(window)
+
+    async def _settle(self, window: ChargeCoalescer) -> None:
+        await asyncio.to_thread(_charge_all, self._payments, window.charges())
+
+
+def _charge_all(payments: Payments, charges: list[Charge]) -> None:
+    for charge in charges:
+        payments.charge(charge.cc, charge.amount)
+
+
+# Runs every charge from `charges` through a `SettlementPipeline`.
+async def settle(charges: Iterable[Charge] | AsyncIterable[Charge], payments: Payments, window_size: int = 1000,
+                 window_time: float = 1.0, max_pending: int = 10_000) -> None:
+    async with SettlementPipeline(payments, window_size, window_time, max_pending) as pipeline:
+        if isinstance(charges, AsyncIterable):
+            async for charge in charges:
+                await pipeline.submit(charge)
+        else:
+            for charge in charges:
+                await pipeline.submit(charge)
@@ -1,7 +1,9 @@
 # First, a findFirst, specialized to `String`.
 # Ideally, we could generalize this to work for any `list` type.
 
-from common.tail_call import TailCall, Return, Suspend
+from bisect import bisect_left
+from functools import partial
+from typing import Iterable
 
 
 # First, a binary search implementation, specialized to `float`,
@@ -9,36 +11,39 @@ from common.tail_call import TailCall, Return, Suspend
 # point numbers
 # Ideally, we could generalize this to work for any `list` type,
 # so long as we have some way of comparing elements of the `list`
+#
+# Each probe only narrows `low` and `high`, so the search is a plain loop rather than a trampoline, which would
+# allocate a `Suspend` and a closure per probe. When the key is missing the result is `-mid - 1`, where `mid` is the
+# last index probed.
 def binary_search(ds: list[float], key: float) -> int:
-    def go(low: int, mid: int, high: int) -> TailCall[int]:
-        if low > high:
-            return Return(-mid - 1)
+    low, mid, high = 0, 0, len(ds) - 1
+    while low <= high:
+        mid = (low + high) // 2
+        d = ds[mid]
+        if d == key:
+            return mid
+        elif d > key:
+            high = mid - 1
         else:
-            mid2 = (low + high) // 2
-            d = ds[mid2]
-            if d == key:
-                return Return(mid2)
-            elif d > key:
-                return Suspend(lambda: go(low, mid2, mid2 - 1))
-            else:
-                return Suspend(lambda: go(mid2 + 1, mid2, high))
+            low = mid + 1
+    return -mid - 1
 
-    return go(0, 0, len(ds) - 1).eval()
 
+# Looks up many keys in the same sorted list. The result for each key is its insertion point: the index of its first
+# occurrence if it is present, and otherwise the index at which it would have to be inserted to keep `ds` sorted.
+# `bisect_left` runs the search in C.
+def insertion_points(ds: list[float], keys: Iterable[float]) -> list[int]:
+    return list(map(partial(bisect_left, ds), keys))
 
+
+# For repeated lookups in the same list, see `polymorphic_functions.SearchIndex`.
 def find_first(ss: list[str], key: str) -> int:
-    def loop(n: int) -> TailCall[int]:
-        # If `n` is past the end of the list, return `-1`
-        # indicating the key doesn't exist in the list.
-        if n >= len(ss):
-            return Return(-1)
-        # `ss[n]` extracts the n'th element of the list `ss`.
+    # `enumerate` pairs each element with its index, starting at the first element of the list.
+    for n, s in enumerate(ss):
         # If the element at `n` is equal to the key, return `n`
         # indicating that the element appears in the list at that index.
-        elif ss[n] == key:
-            return Return(n)
-        else:
-            return Suspend(lambda: loop(n + 1))  # Otherwise increment `n` and keep looking.
-
-    # Start the loop at the first element of the list.
-    return loop(0).eval()
+        if s == key:
+            return n
+    # If we get past the end of the list, return `-1`
+    # indicating the key doesn't exist in the list.
+    return -1
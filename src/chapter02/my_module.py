@@ -1,6 +1,7 @@
+from functools import lru_cache
 from typing import Callable
 
-from common.tail_call import TailCall, Return, Suspend
+from common.numeric import to_decimal_string
 
 # A comment!
 # Another comment
@@ -20,15 +21,21 @@ if __name__ == '__main__':
     print(__format_abs(-42))
 
 
-# A definition of factorial, using a local, tail recursive function
+# A definition of factorial as a balanced product tree: the product of `lo..hi` is the product of its two halves. The
+# numbers being multiplied stay about the same size, which is much faster for large `n` than multiplying a huge
+# accumulator by one small number at a time, and the recursion is only log2(n) deep. Recent results are memoized.
+@lru_cache(maxsize=128)
 def factorial(n: int) -> int:
-    def go(x: int, acc: int) -> TailCall[int]:
-        if x <= 0:
-            return Return(acc)
-        else:
-            return Suspend(lambda: go(x - 1, x * acc))
+    def product(lo: int, hi: int) -> int:
+        if hi - lo < 8:
+            acc = lo
+            for i in range(lo + 1, hi + 1):
+                acc *= i
+            return acc
+        mid = (lo + hi) // 2
+        return product(lo, mid) * product(mid + 1, hi)
 
-    return go(n, 1).eval()
+    return product(1, n) if n > 1 else 1
 
 
 # Another implementation of `factorial`, this time with a `while` loop
@@ -43,14 +50,21 @@ def factorial2(n: int) -> int:
 
 # Exercise 1: Write a function to compute the nth fibonacci number
 
-# 0 and 1 are the first two numbers in the sequence,
-# so we start the accumulators with those.
-# At every iteration, we add the two numbers to get the next one.
+# 0 and 1 are the first two numbers in the sequence. Adding the last two numbers to get the next one takes n steps;
+# instead we use the "fast doubling" identities
+#
+#   fib(2k)     = fib(k) * (2 * fib(k + 1) - fib(k))
+#   fib(2k + 1) = fib(k)^2 + fib(k + 1)^2
+#
+# and walk the bits of `n` from the highest, doubling `k` at each bit and adding one when the bit is set. That takes
+# O(log n) multiplications. Recent results are memoized.
+@lru_cache(maxsize=128)
 def fib(n: int) -> int:
-    def loop(x: int, prev: int, cur: int) -> TailCall[int]:
-        return Return(prev) if x == 0 else Suspend(lambda: loop(x - 1, cur, prev + cur))
-
-    return loop(n, 0, 1).eval()
+    prev, cur = 0, 1
+    for bit in bin(n)[2:] if n > 0 else '':
+        doubled, next_doubled = prev * (2 * cur - prev), prev * prev + cur * cur
+        prev, cur = (next_doubled, doubled + next_doubled) if bit == '1' else (doubled, next_doubled)
+    return prev
 
 
 # This definition and `formatAbs` are very similar..
@@ -60,7 +74,8 @@ def __format_factorial(n: int) -> str:
 
 
 # We can generalize `formatAbs` and `formatFactorial` to
-# accept a _function_ as a parameter
+# accept a _function_ as a parameter. The result goes through `to_decimal_string`, since results like `factorial(10000)`
+# are too long for `%d`.
 def format_result(name: str, n: int, f: Callable[[int], int]) -> str:
-    msg = 'The %s of %d is %d.'
-    return msg % (name, n, f(n))
+    msg = 'The %s of %d is %s.'
+    return msg % (name, n, to_decimal_string(f(n)))
@@ -1,6 +1,7 @@
-from typing import TypeVar, Callable
-
-from common.tail_call import TailCall, Return, Suspend
+from collections import OrderedDict
+from functools import cmp_to_key
+from itertools import islice
+from typing import TypeVar, Generic, Callable, Iterable, Sequence
 
 A = TypeVar('A')
 B = TypeVar('B')
@@ -10,21 +11,45 @@ C = TypeVar('C')
 # Here's a polymorphic version of `binarySearch`, parameterized on
 # a function for testing whether an `A` is greater than another `A`.
 def binary_search(xs: list[A], key: A, gt: Callable[[A, A], bool]) -> int:
-    def go(low: int, mid: int, high: int) -> TailCall[int]:
-        if low > high:
-            return Return(-mid - 1)
+    low, mid, high = 0, 0, len(xs) - 1
+    while low <= high:
+        mid = (low + high) // 2
+        x = xs[mid]
+        greater = gt(x, key)
+        if not greater and not gt(key, x):
+            return mid
+        elif greater:
+            high = mid - 1
         else:
-            mid2 = (low + high) // 2
-            x = xs[mid2]
-            greater = gt(x, key)
-            if not greater and not gt(key, x):
-                return Return(mid2)
-            elif greater:
-                return Suspend(lambda: go(low, mid2, mid2 - 1))
-            else:
-                return Suspend(lambda: go(mid2 + 1, mid2, high))
-
-    return go(0, 0, len(xs) - 1).eval()
+            low = mid + 1
+    return -mid - 1
+
+
+# The insertion point of each of `keys` in `xs`, as in `monomorphic_binary_search.insertion_points`. The keys are
+# visited in sorted order, so each search can start where the previous one ended: the searched part of `xs` shrinks as
+# the sweep goes, and keys that are close together cost only a few comparisons each.
+def insertion_points(xs: list[A], keys: Sequence[A], gt: Callable[[A, A], bool]) -> list[int]:
+    def compare(i: int, j: int) -> int:
+        return 1 if gt(keys[i], keys[j]) else -1 if gt(keys[j], keys[i]) else 0
+
+    points = [0] * len(keys)
+    low = 0
+    for i in sorted(range(len(keys)), key=cmp_to_key(compare)):
+        low = _lower_bound(xs, keys[i], gt, low)
+        points[i] = low
+    return points
+
+
+# The first index at or after `low` whose element is not less than `key`.
+def _lower_bound(xs: list[A], key: A, gt: Callable[[A, A], bool], low: int) -> int:
+    high = len(xs)
+    while low < high:
+        mid = (low + high) // 2
+        if gt(key, xs[mid]):
+            low = mid + 1
+        else:
+            high = mid
+    return low
 
 
 # Here's a polymorphic version of `find_first`, parameterized on
@@ -33,31 +58,65 @@ def binary_search(xs: list[A], key: A, gt: Callable[[A, A], bool]) -> int:
 # And instead of hard-coding an equality check for a given key,
 # we take a function with which to test each element of the list.
 def find_first(xs: list[A], p: Callable[[A], bool]) -> int:
-    def loop(n: int) -> TailCall[int]:
-        if n >= len(xs):
-            return Return(-1)
+    for n, x in enumerate(xs):
         # If the function `p` matches the current element,
         # we've found a match and we return its index in the list.
-        elif p(xs[n]):
-            return Return(n)
-        else:
-            return Suspend(lambda: loop(n + 1))
-
-    return loop(0).eval()
+        if p(x):
+            return n
+    return -1
+
+
+# Answers repeated `find_first` queries against the same list without scanning it each time. Equality lookups go
+# through a dictionary from each value to the index of its first occurrence, so values must be hashable. The results
+# of `find_first` are cached for the `max_predicates` most recently used predicates, so a predicate that is asked about
+# again (the same function object, not an equivalent lambda) costs a dictionary lookup. Define a predicate once and
+# reuse it to benefit; for equality use `index_of` rather than `find_first(lambda x: x == key)`.
+#
+# Appending an element updates both: it is recorded if its value is new, and it is tested against the cached
+# predicates that had no match so far, so `append` costs O(number of cached predicates), at most `max_predicates`.
+class SearchIndex(Generic[A]):
+    def __init__(self, xs: Iterable[A] = (), max_predicates: int = 64) -> None:
+        self._items: list[A] = []
+        self._positions: dict[A, int] = {}
+        self._found: OrderedDict[Callable[[A], bool], int] = OrderedDict()
+        self._max_predicates = max_predicates
+        for x in xs:
+            self.append(x)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def append(self, x: A) -> None:
+        n = len(self._items)
+        self._items.append(x)
+        self._positions.setdefault(x, n)
+        for p, found in self._found.items():
+            if found < 0 and p(x):
+                self._found[p] = n
+
+    def index_of(self, key: A) -> int:
+        return self._positions.get(key, -1)
+
+    def find_first(self, p: Callable[[A], bool]) -> int:
+        found = self._found.get(p)
+        if found is not None:
+            self._found.move_to_end(p)
+            return found
+        found = find_first(self._items, p)
+        if self._max_predicates > 0:
+            self._found[p] = found
+            if len(self._found) > self._max_predicates:
+                self._found.popitem(last=False)
+        return found
 
 
 # Exercise 2: Implement a polymorphic function to check whether
 # a `list[A]` is sorted
+#
+# Every adjacent pair is compared with `map` over `xs` and `xs` shifted by one, and `any` stops at the first pair that
+# is out of order.
 def is_sorted(xs: list[A], gt: Callable[[A, A], bool]) -> bool:
-    def go(n: int) -> TailCall[bool]:
-        if n >= len(xs) - 1:
-            return Return(True)
-        elif gt(xs[n], xs[n + 1]):
-            return Return(False)
-        else:
-            return Suspend(lambda: go(n + 1))
-
-    return go(0).eval()
+    return not any(map(gt, xs, islice(xs, 1, None)))
 
 
 # Polymorphic functions are often so constrained by their type
@@ -1,6 +1,7 @@
-from dataclasses import dataclass
-from typing import TypeVar, Generic, Callable
+from dataclasses import dataclass, field
+from typing import TypeVar, Generic, Callable, Iterable, Iterator, Sequence
 
+from common import matching
 from common.tail_call import TailCall, Return, Suspend
 
 A = TypeVar('A')
@@ -9,20 +10,49 @@ C = TypeVar('C')
 Nothing = TypeVar('Nothing')
 
 class List(Generic[A]):  # `List` data type, parameterized on a type, `A`
-    pass
+    __slots__ = ()
 
+    def __len__(self) -> int:  # Every node caches the length of the list it starts.
+        return self._size
 
-@dataclass(frozen=True)
-class Nil(List[Nothing]):  # A `List` data constructor representing the empty list
-    pass
+    def __iter__(self) -> Iterator[A]:
+        xs = self
+        while isinstance(xs, Cons):
+            yield xs.head
+            xs = xs.tail
+
+
+# A `List` data constructor representing the empty list. There is only one empty list, so `Nil()` always returns the
+# same instance.
+@dataclass(frozen=True, slots=True)
+class Nil(List[Nothing]):
+    _size = 0
+    _instance = None
+
+    def __new__(cls) -> 'Nil':
+        if cls._instance is None:
+            cls._instance = object.__new__(cls)
+        return cls._instance
 
 
 # Another data constructor, representing nonempty lists. Note that `tail` is another `List[A]`,
-# which may be `Nil` or another `Cons`.
-@dataclass(frozen=True)
+# which may be `Nil` or another `Cons`. The fields are written through their slot descriptors, which is much cheaper
+# than the `object.__setattr__` calls of a generated frozen `__init__`.
+@dataclass(frozen=True, slots=True, init=False)
 class Cons(List[A]):
     head: A
     tail: List[A]
+    _size: int = field(init=False, repr=False, compare=False)
+
+    def __init__(self, head: A, tail: List[A]) -> None:
+        _set_head(self, head)
+        _set_tail(self, tail)
+        _set_size(self, tail._size + 1)
+
+
+_set_head = Cons.head.__set__
+_set_tail = Cons.tail.__set__
+_set_size = Cons._size.__set__
 
 
 # `list` module. Contains functions for creating and working with lists.
@@ -46,10 +76,16 @@ def product(ds: List[float]) -> float:
 
 
 def listOf(*xs: A) -> List[A]:  # Variadic function syntax
-    if len(xs) == 0:
-        return Nil()
-    else:
-        return Cons(xs[0], listOf(*xs[1:]))
+    return fromIterable(xs)
+
+
+# Builds the list back to front in one pass. The recursive `Cons(xs[0], listOf(*xs[1:]))` copies the remaining
+# elements at every level, which is quadratic, and uses a stack frame per element.
+def fromIterable(xs: Iterable[A]) -> List[A]:
+    l: List[A] = Nil()
+    for h in reversed(xs if isinstance(xs, Sequence) else list(xs)):
+        l = Cons(h, l)
+    return l
 
 
 def x() -> int:
@@ -169,7 +205,7 @@ def init2(l: List[A]) -> List[A]:
             case Nil():
                 raise RuntimeError('init of empty list')
             case Cons(_, Nil()):
-                return Return(listOf(*buf))
+                return Return(fromIterable(buf))
             case Cons(h, t):
                 buf.append(h)
                 return Suspend(lambda: go(t))
@@ -297,7 +333,7 @@ def map_2(l: List[A], f: Callable[[A], B]) -> List[B]:
                 return Suspend(lambda: go(t))
 
     go(l).eval()
-    return listOf(*buf)  # converting from the standard Scala list to the list we've defined here
+    return fromIterable(buf)  # converting from the standard Scala list to the list we've defined here
 
 
 # The discussion about `map` also applies here.
@@ -321,7 +357,7 @@ def filter_2(l: List[A], f: Callable[[A], bool]) -> List[A]:
                 return Suspend(lambda: go(t))
 
     go(l).eval()
-    return listOf(*buf)  # converting from the standard Scala list to the list we've defined here
+    return fromIterable(buf)  # converting from the standard Scala list to the list we've defined here
 
 
 # This could also be implemented directly using `foldRight`.
@@ -392,14 +428,8 @@ def startsWith(l: List[A], prefix: List[A]) -> bool:
     return go(l, prefix).eval()
 
 
+# The recursive definition tries `startsWith` at every position of `sup`, which is O(n * m) in the worst case (think of
+# looking for `1, 1, 2` in a long run of 1s). `matching.contains` uses the Knuth-Morris-Pratt algorithm, which reads
+# each element of `sup` once, and treats the empty list as a subsequence of every list.
 def hasSubsequence(sup: List[A], sub: List[A]) -> bool:
-    def go(sup: List[A], sub: List[A]) -> TailCall[bool]:
-        match sup:
-            case Nil():
-                return Return(sub == Nil())
-            case _ if startsWith(sup, sub):
-                return Return(True)
-            case Cons(_, t):
-                return Suspend(lambda: go(t, sub))
-
-    return go(sup, sub).eval()
+    return matching.contains(sup, tuple(sub))
@@ -0,0 +1,93 @@
+from typing import TypeVar, Optional, Iterable
+
+from chapter03.tree import Tree, Leaf, Branch, Measure, measure, depth, fromSequence
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+# A persistent ordered map built from ordinary `Leaf`/`Branch` nodes, so `fold`, `map`, `size` and `depth` from
+# `chapter03.tree` work on it unchanged. Entries are `(key, value)` pairs stored in the leaves in key order; `None` is
+# the empty map.
+#
+# To route a search, a `Branch` needs the largest key of its left subtree. That is a `Measure`, so it is cached on
+# each node and costs O(1) after the first query. Balance is maintained AVL-style from the cached depths: updates
+# rebuild one root-to-leaf path, rotating where the depths of two siblings differ by more than one, so the tree stays
+# O(log n) deep and every untouched subtree is shared with the previous version.
+SearchTree = Optional[Tree[tuple[K, V]]]
+
+MAX_KEY: Measure = Measure(lambda kv: kv[0], max)
+
+
+def _max_key(t: Tree[tuple[K, V]]) -> K:
+    return measure(t, MAX_KEY)
+
+
+def _balance(l: Tree[tuple[K, V]], r: Tree[tuple[K, V]]) -> Tree[tuple[K, V]]:
+    if depth(l) > depth(r) + 1:
+        ll, lr = l.left, l.right
+        if depth(ll) >= depth(lr):
+            return Branch(ll, Branch(lr, r))
+        return Branch(Branch(ll, lr.left), Branch(lr.right, r))
+    if depth(r) > depth(l) + 1:
+        rl, rr = r.left, r.right
+        if depth(rr) >= depth(rl):
+            return Branch(Branch(l, rl), rr)
+        return Branch(Branch(l, rl.left), Branch(rl.right, rr))
+    return Branch(l, r)
+
+
+def insert(t: SearchTree, key: K, value: V) -> Tree[tuple[K, V]]:
+    if t is None:
+        return Leaf((key, value))
+    path: list[tuple[Branch, bool]] = []
+    node = t
+    while isinstance(node, Branch):
+        went_left = key <= _max_key(node.left)
+        path.append((node, went_left))
+        node = node.left if went_left else node.right
+    found = node.value[0]
+    if key == found:
+        rebuilt = Leaf((key, value))
+    elif key < found:
+        rebuilt = Branch(Leaf((key, value)), node)
+    else:
+        rebuilt = Branch(node, Leaf((key, value)))
+    for parent, went_left in reversed(path):
+        rebuilt = _balance(rebuilt, parent.right) if went_left else _balance(parent.left, rebuilt)
+    return rebuilt
+
+
+def lookup(t: SearchTree, key: K) -> Optional[V]:
+    if t is None:
+        return None
+    node = t
+    while isinstance(node, Branch):
+        node = node.left if key <= _max_key(node.left) else node.right
+    k, v = node.value
+    return v if k == key else None
+
+
+# The entries with `lo <= key < hi`, in key order. Subtrees that lie entirely outside the range are skipped, so this
+# costs O(log n + k) for k results.
+def itemsBetween(t: SearchTree, lo: K, hi: K) -> list[tuple[K, V]]:
+    items: list[tuple[K, V]] = []
+    pending = [t] if t is not None else []
+    while pending:
+        node = pending.pop()
+        match node:
+            case Leaf((k, v)):
+                if lo <= k < hi:
+                    items.append((k, v))
+            case Branch(l, r):
+                split = _max_key(l)
+                if split < hi:
+                    pending.append(r)
+                if lo <= split:
+                    pending.append(l)
+    return items
+
+
+# Builds a balanced map in O(n) from entries already sorted by key, with no duplicate keys.
+def fromSortedItems(items: Iterable[tuple[K, V]]) -> SearchTree:
+    entries = list(items)
+    return fromSequence(entries) if entries else None
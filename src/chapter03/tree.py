@@ -1,71 +1,295 @@
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import TypeVar, Generic, Callable
+from functools import partial
+from typing import TypeVar, Generic, Callable, Optional, Iterable, Sequence
+
+from common.interning import Interner
 
 A = TypeVar('A')
 B = TypeVar('B')
 C = TypeVar('C')
 
 
+# Equality and hashing walk the tree with an explicit stack instead of recursing like the generated dataclass methods
+# would. Every node caches its hash once computed, so trees with different cached hashes are unequal without being
+# traversed, and shared subtrees (for example from `intern_tree`) compare by identity.
 class Tree(Generic[A]):
-    pass
+    _measures = None
+    _hash = None
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Tree):
+            return NotImplemented
+        pending = [(self, other)]
+        while pending:
+            a, b = pending.pop()
+            if a is b:
+                continue
+            if type(a) is not type(b) or a._size != b._size:
+                return False
+            ha, hb = a._hash, b._hash
+            if ha is not None and hb is not None and ha != hb:
+                return False
+            if type(a) is Leaf:
+                if not (a.value is b.value or a.value == b.value):
+                    return False
+            else:
+                pending.append((a.right, b.right))
+                pending.append((a.left, b.left))
+        return True
 
-@dataclass(frozen=True)
+    def __hash__(self) -> int:
+        if self._hash is None:
+            _summarize(self, lambda a: hash((a,)), lambda l, r: hash((l, r)), _cached_hash, _cache_hash)
+        return self._hash
+
+
+# Nodes are immutable, so each one can cache facts about the subtree it starts. Size and depth are computed from the
+# children when a node is built, which is O(1) per node. The hash and the summaries for any `Measure` are computed on
+# first use and cached in `_hash` and `_measures`. Until then a node reads the `None` defaults on `Tree`, so nodes that
+# never cache anything don't store them.
+#
+# Nodes pickle as just their contents. The caches stay behind: a `Measure` usually holds lambdas, which can't be
+# pickled, and the hash of a `str` differs between processes. A `Branch` is flattened into its shape and leaf values in
+# post-order (see `_encode`), so pickling doesn't recurse once per level and works for trees of any depth.
+@dataclass(frozen=True, eq=False)
 class Leaf(Tree[A]):
     value: A
+    _size = 1
+    _depth = 0
 
+    def __reduce__(self):
+        return Leaf, (self.value,)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, eq=False)
 class Branch(Tree[A]):
     left: Tree[A]
     right: Tree[A]
 
+    def __post_init__(self) -> None:
+        l, r = self.left, self.right
+        object.__setattr__(self, '_size', 1 + l._size + r._size)
+        object.__setattr__(self, '_depth', 1 + (l._depth if l._depth > r._depth else r._depth))
+
+    def __reduce__(self):
+        return _decode, _encode(self)
+
+
+# A monoid-like summary of a tree: `leaf` measures a single value and `combine` merges the summaries of two subtrees.
+# Summaries are cached per `Measure` object on every node, so a measure should be created once and reused. Rebuilding
+# one path of a tree only recomputes the summaries of the new nodes on that path.
+@dataclass(frozen=True)
+class Measure(Generic[A, B]):
+    leaf: Callable[[A], B]
+    combine: Callable[[B, B], B]
+
+
+def measure(t: Tree[A], m: Measure[A, B]) -> B:
+    return _summarize(t, m.leaf, m.combine, lambda node: _cached(node, m), lambda node, value: _cache(node, m, value))
+
+
+# Computes a summary bottom-up with an explicit stack, using `get` and `put` to read and store it on each node, and
+# stopping at nodes that already have one.
+def _summarize(t: Tree[A], leaf: Callable[[A], B], combine: Callable[[B, B], B],
+               get: Callable[[Tree[A]], B], put: Callable[[Tree[A], B], None]) -> B:
+    pending: list[Tree[A]] = [t]
+    while pending:
+        node = pending[-1]
+        if get(node) is not _MISSING:
+            pending.pop()
+            continue
+        match node:
+            case Leaf(a):
+                put(node, leaf(a))
+                pending.pop()
+            case Branch(l, r):
+                left, right = get(l), get(r)
+                if left is _MISSING:
+                    pending.append(l)
+                if right is _MISSING:
+                    pending.append(r)
+                if left is not _MISSING and right is not _MISSING:
+                    put(node, combine(left, right))
+                    pending.pop()
+    return get(t)
+
+
+_MISSING = object()
+
+
+# `shape` has a 0 for each `Leaf` and a 1 for each `Branch`, in post-order, and `values` holds the leaf values in the
+# same order. `_decode` rebuilds the tree with a stack: a 1 joins the two subtrees on top of it.
+def _encode(t: Tree[A]) -> tuple[bytes, list[A]]:
+    shape = bytearray()
+    values: list[A] = []
+    pending: list[Tree[A] | object] = [t]
+    while pending:
+        match pending.pop():
+            case Leaf(a):
+                shape.append(0)
+                values.append(a)
+            case Branch(l, r):
+                pending.append(_COMBINE)
+                pending.append(r)
+                pending.append(l)
+            case _:
+                shape.append(1)
+    return bytes(shape), values
+
+
+def _decode(shape: bytes, values: list[A]) -> Tree[A]:
+    trees: list[Tree[A]] = []
+    leaves = iter(values)
+    for node in shape:
+        if node:
+            r = trees.pop()
+            trees.append(Branch(trees.pop(), r))
+        else:
+            trees.append(Leaf(next(leaves)))
+    return trees.pop()
+
+
+def _cached(t: Tree[A], m: Measure[A, B]) -> B:
+    return _MISSING if t._measures is None else t._measures.get(m, _MISSING)
+
+
+def _cache(t: Tree[A], m: Measure[A, B], value: B) -> None:
+    if t._measures is None:
+        object.__setattr__(t, '_measures', {})
+    t._measures[m] = value
+
+
+def _cached_hash(t: Tree[A]) -> int:
+    return _MISSING if t._hash is None else t._hash
+
+
+def _cache_hash(t: Tree[A], value: int) -> None:
+    object.__setattr__(t, '_hash', value)
+
+
+_LEAF_TABLE: Interner[Leaf] = Interner()
+_BRANCH_TABLE: Interner[Branch] = Interner()
+
+
+# Hash-consing constructors: they return the canonical node for the given contents, so equal trees built through them
+# share their nodes and compare by identity. Leaf values must be hashable, and the children of `interned_branch`
+# should themselves be interned.
+def interned_leaf(a: A) -> Tree[A]:
+    return _LEAF_TABLE.intern((type(a), a), lambda: _hashed(Leaf(a)))
 
+
+def interned_branch(l: Tree[A], r: Tree[A]) -> Tree[A]:
+    return _BRANCH_TABLE.intern((id(l), id(r)), lambda: _hashed(Branch(l, r)))
+
+
+def intern_tree(t: Tree[A]) -> Tree[A]:
+    return fold(t, interned_leaf, interned_branch)
+
+
+def _hashed(t: Tree[A]) -> Tree[A]:
+    hash(t)
+    return t
+
+
+# Written out by pattern matching, `size` is `1 + size(l) + size(r)` for a `Branch` and 1 for a `Leaf`. Since every
+# node already knows its size, we just read it.
 def size(t: Tree[A]) -> int:
-    match t:
-        case Leaf(_):
-            return 1
-        case Branch(l, r):
-            return 1 + size(l) + size(r)
+    return t._size
 
 
-# We're using the method `max` that exists on all `Int` values rather than an explicit `if` expression.
-#
-# Note how similar the implementation is to `size`. We'll abstract out the common pattern in a later exercise.
+MAXIMUM: Measure[int, int] = Measure(lambda n: n, max)
+
+
+# We're using the function `max` rather than an explicit `if` expression. Note how similar it is to `size`: the
+# recursive version is `max(maximum(l), maximum(r))`, which is exactly what `MAXIMUM` combines and caches.
 def maximum(t: Tree[int]) -> int:
-    match t:
-        case Leaf(n):
-            return n
-        case Branch(l, r):
-            return max(maximum(l), maximum(r))
+    return measure(t, MAXIMUM)
 
 
-# Again, note how similar the implementation is to `size` and `maximum`.
+# Again, note how similar this is to `size` and `maximum`: recursively it is `1 + max(depth(l), depth(r))`.
 def depth(t: Tree[A]) -> int:
-    match t:
-        case Leaf(_):
-            return 0
-        case Branch(l, r):
-            return 1 + max(depth(l), depth(r))
+    return t._depth
 
 
+# The recursive definition would be `Branch(map(l, f), map(r, f))`; rebuilding through `fold` keeps it stack-safe.
 def map(t: Tree[A], f: Callable[[A], B]) -> Tree[B]:
-    match t:
-        case Leaf(a):
-            return Leaf(f(a))
-        case Branch(l, r):
-            return Branch(map(l, f), map(r, f))
+    return fold(t, lambda a: Leaf(f(a)), Branch)
 
 
 # Like `foldRight` for lists, `fold` receives a "handler" for each of the data constructors of the type, and recursively
 # accumulates some value using these handlers. As with `foldRight`, `fold(t)(Leaf(_))(Branch(_,_)) == t`, and we can use
 # this function to implement just about any recursive function that would otherwise be defined by pattern matching.
+#
+# The natural definition, `g(fold(l, f, g), fold(r, f, g))`, uses a stack frame per level and fails on trees deeper
+# than the recursion limit. Instead we walk the tree in post-order with an explicit stack: a `Branch` pushes a marker
+# followed by its children, and when the marker is popped the results of both children are on top of `results`.
 def fold(t: Tree[A], f: Callable[[A], B], g: Callable[[B, B], B]) -> B:
+    results: list[B] = []
+    pending: list[Tree[A] | object] = [t]
+    while pending:
+        match pending.pop():
+            case Leaf(a):
+                results.append(f(a))
+            case Branch(l, r):
+                pending.append(_COMBINE)
+                pending.append(r)
+                pending.append(l)
+            case _:
+                r = results.pop()
+                results.append(g(results.pop(), r))
+    return results.pop()
+
+
+_COMBINE = object()
+
+
+# `fold` evaluated in parallel. The nodes `cutoff` levels below the root are folded as independent tasks on `executor`
+# (a new `ProcessPoolExecutor` by default), and the results are combined with `g` along the top of the tree, the same
+# way `fold` would. By default the cutoff gives about four tasks per core on a balanced tree.
+#
+# With a process pool, `f`, `g`, the leaf values and the results must be picklable, so `f` and `g` should be module
+# level functions rather than lambdas. Each task ships its whole subtree, which only pays off when `f` is expensive.
+def par_fold(t: Tree[A], f: Callable[[A], B], g: Callable[[B, B], B], executor: Optional[Executor] = None,
+             cutoff: Optional[int] = None) -> B:
+    if cutoff is None:
+        cutoff = math.ceil(math.log2(4 * (os.cpu_count() or 1)))
+    subtrees: list[Tree[A]] = []
+    top = _split(t, cutoff, subtrees)
+    work = partial(_fold_subtree, f, g)
+    if executor is None:
+        with ProcessPoolExecutor() as pool:
+            results = list(pool.map(work, subtrees))
+    else:
+        results = list(executor.map(work, subtrees))
+    return fold(top, results.__getitem__, g)
+
+
+# `map` through `par_fold`. The mapped subtrees are built in the workers and sent back.
+def par_map(t: Tree[A], f: Callable[[A], B], executor: Optional[Executor] = None,
+            cutoff: Optional[int] = None) -> Tree[B]:
+    return par_fold(t, partial(_map_leaf, f), Branch, executor, cutoff)
+
+
+# Copies the top `cutoff` levels of `t`, replacing each node at the cutoff, and each leaf above it, by a `Leaf` holding
+# the index of that subtree in `subtrees`.
+def _split(t: Tree[A], cutoff: int, subtrees: list[Tree[A]]) -> Tree[int]:
     match t:
-        case Leaf(a):
-            return f(a)
-        case Branch(l, r):
-            return g(fold(l, f, g), fold(r, f, g))
+        case Branch(l, r) if cutoff > 0:
+            return Branch(_split(l, cutoff - 1, subtrees), _split(r, cutoff - 1, subtrees))
+        case _:
+            subtrees.append(t)
+            return Leaf(len(subtrees) - 1)
+
+
+def _fold_subtree(f: Callable[[A], B], g: Callable[[B, B], B], t: Tree[A]) -> B:
+    return fold(t, f, g)
+
+
+def _map_leaf(f: Callable[[A], B], a: A) -> Tree[B]:
+    return Leaf(f(a))
 
 
 def sizeViaFold(t: Tree[A]) -> int:
@@ -107,3 +331,21 @@ def leaf(a: A) -> Tree[A]:
 
 def branch(l: Tree[B], r: Tree[B]) -> Tree[B]:
     return Branch(l, r)
+
+
+# Builds a balanced tree with the elements of `xs` as its leaves, in order. Each `Branch` splits its range in half, so
+# sibling subtrees differ in size by at most one and the depth is ceil(log2(n)). The recursion is only that deep.
+def fromSequence(xs: Sequence[A]) -> Tree[A]:
+    def go(lo: int, hi: int) -> Tree[A]:
+        if hi - lo == 1:
+            return Leaf(xs[lo])
+        mid = (lo + hi) // 2
+        return Branch(go(lo, mid), go(mid, hi))
+
+    if len(xs) == 0:
+        raise RuntimeError('tree of empty sequence')
+    return go(0, len(xs))
+
+
+def fromIterable(xs: Iterable[A]) -> Tree[A]:
+    return fromSequence(xs if isinstance(xs, Sequence) else list(xs))
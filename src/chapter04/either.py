@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import TypeVar, Generic, Callable
+from functools import partial
+from typing import TypeVar, Generic, Callable, Iterable, Optional
+
+from common.list import List, from_sequence
 
 E = TypeVar('E')
 A = TypeVar('A')
@@ -10,27 +14,30 @@ C = TypeVar('C')
 Nothing = TypeVar('Nothing')
 
 
+# A `Left` passes through `map` and `flat_map`, and a `Right` through `or_else`, as the same object rather than a copy.
 class Either(Generic[E, A]):
+    __slots__ = ()
+
     def map(self, f: Callable[[A], B]) -> Either[E, B]:
         match self:
             case Right(a):
                 return Right(f(a))
-            case Left(e):
-                return Left(e)
+            case _:
+                return self
 
     def flat_map(self, f: Callable[[A], Either[E, B]]) -> Either[E, B]:
         match self:
-            case Left(e):
-                return Left(e)
             case Right(a):
                 return f(a)
+            case _:
+                return self
 
     def or_else(self, b: Callable[[], Either[E, A]]) -> Either[E, A]:
         match self:
-            case Left(_):
+            case Right(_):
+                return self
+            case _:
                 return b()
-            case Right(a):
-                return Right(a)
 
     def map2(self, b: Either[E, B], f: Callable[[A, B], C]) -> Either[E, C]:
         return self.flat_map(lambda a: b.map(lambda b1: f(a, b1)))
@@ -43,11 +50,76 @@ def Try(a: Callable[[], A]) -> Either[Exception, A]:
         return Left(e)
 
 
-@dataclass
+# Both make a single pass over `a` and stop at the first `Left`, which becomes the result.
+def sequence(a: List[Either[E, A]]) -> Either[E, List[A]]:
+    values = []
+    for x in a:
+        match x:
+            case Right(v):
+                values.append(v)
+            case _:
+                return x
+    return Right(from_sequence(values))
+
+
+def traverse(a: List[A], f: Callable[[A], Either[E, B]]) -> Either[E, List[B]]:
+    values = []
+    for x in a:
+        match f(x):
+            case Right(b):
+                values.append(b)
+            case left:
+                return left
+    return Right(from_sequence(values))
+
+
+# Unlike `traverse`, these keep going after a `Left`: the result is either every value, or every error paired with the
+# index of the element it came from, in order. The elements can be checked on an `executor`, in which case `f` (or the
+# validators) must be safe to run concurrently, and picklable for a process pool. A process pool sends one message per
+# `chunksize` elements, so for large batches pass a `chunksize` in the hundreds or thousands; a thread pool ignores it.
+def traverse_all(a: List[A], f: Callable[[A], Either[E, B]],
+                 executor: Optional[Executor] = None, chunksize: int = 1) -> Either[List[tuple[int, E]], List[B]]:
+    values = []
+    errors = []
+    for i, x in enumerate(map(f, a) if executor is None else executor.map(f, a, chunksize=chunksize)):
+        match x:
+            case Right(b):
+                values.append(b)
+            case Left(e):
+                errors.append((i, e))
+    return Left(from_sequence(errors)) if errors else Right(from_sequence(values))
+
+
+# Runs every validator on every element, so an element can contribute several errors. The values are kept as they are.
+def validate_all(a: List[A], validators: Iterable[Callable[[A], Either[E, object]]],
+                 executor: Optional[Executor] = None, chunksize: int = 1) -> Either[List[tuple[int, E]], List[A]]:
+    check = partial(_validate, tuple(validators))
+    errors = []
+    for i, es in enumerate(map(check, a) if executor is None else executor.map(check, a, chunksize=chunksize)):
+        errors.extend((i, e) for e in es)
+    return Left(from_sequence(errors)) if errors else Right(a)
+
+
+def _validate(validators: tuple[Callable[[A], Either[E, object]], ...], a: A) -> list[E]:
+    errors = []
+    for validator in validators:
+        match validator(a):
+            case Left(e):
+                errors.append(e)
+    return errors
+
+
+# `Try` over a batch of thunks, collecting every exception raised.
+def try_all(thunks: List[Callable[[], A]],
+            executor: Optional[Executor] = None, chunksize: int = 1) -> Either[List[tuple[int, Exception]], List[A]]:
+    return traverse_all(thunks, Try, executor, chunksize)
+
+
+@dataclass(slots=True)
 class Left(Either[E, Nothing]):
     get: E
 
 
-@dataclass
+@dataclass(slots=True)
 class Right(Either[Nothing, A]):
     get: A
@@ -1,35 +1,45 @@
 from __future__ import annotations
 
-import math
 from dataclasses import dataclass
 from typing import TypeVar, Generic, Callable, Any
 
-from common.list import List, Nil, Cons, empty_list
+from common import numeric
+from common.list import List, Cons, empty_list, from_sequence
 
 A = TypeVar('A', covariant=True)
 B = TypeVar('B')
 C = TypeVar('C')
 
 
+# Every combinator matches on `self` directly rather than being composed from the others, and an empty or unchanged
+# result is `self`, so no intermediate `Some` or `Nothing` is created.
 class Option(Generic[A]):
+    __slots__ = ()
+
     def map(self, f: Callable[[A], B]) -> Option[A]:
         match self:
-            case Nothing():
-                return Nothing()
             case Some(a):
                 return Some(f(a))
+            case _:
+                return self
 
     def getOrElse(self, default: Callable[[], A]) -> A:
         match self:
-            case Nothing():
-                return default()
             case Some(a):
                 return a
+            case _:
+                return default()
 
+    # This could be written as `self.map(f).getOrElse(Nothing)`, but that wraps the result of `f` in a `Some` only to
+    # unwrap it again.
     def flatMap(self, f: Callable[[A], Option[B]]) -> Option[B]:
-        return self.map(f).getOrElse(Nothing)
+        match self:
+            case Some(a):
+                return f(a)
+            case _:
+                return self
 
-    # Of course, we can also implement `flatMap` with explicit pattern matching.
+    # The explicit pattern matching version.
     def flatMap_1(self, f: Callable[[A], Option[B]]) -> Option[B]:
         match self:
             case Nothing():
@@ -37,8 +47,13 @@ class Option(Generic[A]):
             case Some(a):
                 return f(a)
 
+    # Likewise, `self.map(lambda it: Some(it)).getOrElse(ob)` would wrap the value in a second `Some`.
     def orElse(self, ob: Callable[[], Option[A]]) -> Option[A]:
-        return self.map(lambda it: Some(it)).getOrElse(ob)
+        match self:
+            case Some(_):
+                return self
+            case _:
+                return ob()
 
     # Again, we can implement this with explicit pattern matching.
     def orElse_1(self, ob: Callable[[], Option[B]]) -> Option[B]:
@@ -60,12 +75,18 @@ class Option(Generic[A]):
         return self.flatMap(lambda a: Some(a) if f(a) else Nothing())
 
 
-@dataclass
+# `Nothing` is a singleton: every `Nothing()` returns the same instance.
+@dataclass(frozen=True, slots=True)
 class Nothing(Option[A]):
-    pass
+    _instance = None
 
+    def __new__(cls) -> Nothing:
+        if cls._instance is None:
+            cls._instance = object.__new__(cls)
+        return cls._instance
 
-@dataclass
+
+@dataclass(slots=True)
 class Some(Option[A]):
     get: A
 
@@ -103,8 +124,10 @@ def mean(xs: List[float]) -> Option[float]:
     return Some(xs.sum() / len(xs)) if xs else Nothing()
 
 
+# The squared deviations are reduced directly from the elements of `xs` instead of being mapped into a second `List`
+# and passed to `mean`.
 def variance(xs: List[float]) -> Option[float]:
-    return mean(xs).flatMap(lambda m: mean(xs.map(lambda x: math.pow(x - m, 2))))
+    return mean(xs).map(lambda m: numeric.variance(xs, m))
 
 
 # a bit later in the chapter we'll learn nicer syntax for
@@ -113,13 +136,17 @@ def map2(a: Option[A], b: Option[B], f: Callable[[A, B], C]) -> Option[C]:
     return a.flatMap(lambda aa: b.map(lambda bb: f(aa, bb)))
 
 
-# Here's an explicit recursive version:
+# The explicit recursive version, `h.flatMap(lambda hh: sequence(t).map(lambda tt: Cons(hh, tt)))`, uses a stack frame
+# per element. Here we make one pass instead, collecting the values and stopping at the first `Nothing`.
 def sequence(a: List[Option[A]]) -> Option[List[A]]:
-    match a:
-        case Nil():
-            return Some(Nil())
-        case Cons(h, t):
-            return h.flatMap(lambda hh: sequence(t).map(lambda tt: Cons(hh, tt)))
+    values = []
+    for o in a:
+        match o:
+            case Some(v):
+                values.append(v)
+            case _:
+                return Nothing()
+    return Some(from_sequence(values))
 
 
 # It can also be implemented using `foldRight` and `map2`. The type annotation on `foldRight` is needed here; otherwise
@@ -130,12 +157,16 @@ def sequence_1(a: List[Option[A]]) -> Option[List[A]]:
     return a.fold_right(some(empty_list()), (lambda x, y: map2(x, y, Cons)))
 
 
+# Like `sequence`, but `f` is applied while traversing, so it is not called on anything after the first `Nothing`.
 def traverse(a: List[A], f: Callable[[A], Option[B]]) -> Option[List[B]]:
-    match a:
-        case Nil():
-            return Some(Nil())
-        case Cons(h, t):
-            return map2(f(h), traverse(t, f), Cons)
+    values = []
+    for x in a:
+        match f(x):
+            case Some(b):
+                values.append(b)
+            case _:
+                return Nothing()
+    return Some(from_sequence(values))
 
 
 def traverse_1(a: List[A], f: Callable[[A], Option[B]]) -> Option[List[B]]:
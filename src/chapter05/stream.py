@@ -1,51 +1,52 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TypeVar, Generic, Callable
+from functools import reduce
+from typing import TypeVar, Generic, Callable, Iterator, Iterable
 
 from chapter04.option import Option, Nothing, Some
-from common.list import Cons as ListCons, List, empty_list
-from common.tail_call import TailCall, Return, Suspend
+from common.list import List, from_iterable
 
 A = TypeVar('A', covariant=True)
 B = TypeVar('B')
 C = TypeVar('C')
+S = TypeVar('S')
 Nothing = TypeVar('Nothing')
 
 
+# Traversals walk the cells in a loop instead of recursing, and every `Cons` cell memoizes its head and tail, so a
+# stream can be traversed any number of times with O(n) total work and bounded stack depth, like Scala's `LazyList`.
 class Stream(Generic[A]):
-    def to_list(self) -> List[A]:
-        def go(s: Stream[A], acc: List[A]) -> TailCall[List[A]]:
-            match s:
-                case Cons(h, t):
-                    return Suspend(lambda: go(t(), ListCons(h(), acc)))
-                case _:
-                    return Return(acc)
+    # The generator only refers to the current cell, so cells that have been iterated past can be garbage collected
+    # unless something else still refers to the start of the stream.
+    def __iter__(self) -> Iterator[A]:
+        return _elements(self)
 
-        return go(self, empty_list()).eval().reverse()
+    def to_list(self) -> List[A]:
+        return from_iterable(self)
 
     def take(self, n: int) -> Stream[A]:
         match self:
             case Cons(h, t) if n > 1:
                 return Cons(h, lambda: t().take(n - 1))
             case Cons(h, _) if n == 1:
-                return Cons(h, Empty)
+                return Cons(h, empty)
             case _:
-                return Empty()
+                return empty()
 
     def drop(self, n: int) -> Stream[A]:
-        match self:
-            case Cons(_, t) if n > 0:
-                return t().drop(n - 1)
-            case _:
-                return self
+        s = self
+        while n > 0 and isinstance(s, Cons):
+            s = s.tail()
+            n -= 1
+        return s
 
     def take_while(self, f: Callable[[A], bool]) -> Stream[A]:
         match self:
             case Cons(h, t) if f(h()):
                 return Cons(h, lambda: t().take_while(f))
             case _:
-                return Empty()
+                return empty()
 
     def fold_right(self, z: Callable[[], B], f: Callable[[A, Callable[[], B]], B]) -> B:
         match self:
@@ -54,11 +55,27 @@ class Stream(Generic[A]):
             case _:
                 return z()
 
+    # `fold_right` is as lazy as `f`: it only goes one level deeper each time `f` forces its second argument. That is
+    # what lets `exists`-style folds stop early, but an `f` that always forces it needs one stack frame per element and
+    # fails on long streams; this can't be avoided, since `f` itself makes the nested call. When `f` is strict, use
+    # `fold` (left to right) or `fold_right_strict` instead: both are loops and work on streams of any (finite) length.
+    def fold(self, z: B, f: Callable[[B, A], B]) -> B:
+        return reduce(f, self, z)
+
+    # Forces the whole stream and then combines from the right, keeping the elements in a list rather than on the stack.
+    def fold_right_strict(self, z: B, f: Callable[[A, B], B]) -> B:
+        acc = z
+        for a in reversed(list(self)):
+            acc = f(a, acc)
+        return acc
+
+    # The combinators below are written as loops rather than with `fold_right`.
     def map(self, f: Callable[[A], B]) -> Stream[B]:
-        return self.fold_right(
-            lambda: empty(),
-            (lambda h, t: Cons(lambda: f(h), t))
-        )
+        match self:
+            case Cons(h, t):
+                return Cons(lambda: f(h()), lambda: t().map(f))
+            case _:
+                return empty()
 
     def head_option(self) -> Option[A]:
         match self:
@@ -68,25 +85,102 @@ class Stream(Generic[A]):
                 return Some(h())
 
     def exists(self, p: Callable[[A], bool]) -> bool:
-        return self.fold_right(lambda: False, (lambda a, b: p(a) or b()))
+        return any(map(p, self))
 
     def for_all(self, f: Callable[[A], bool]) -> bool:
-        return self.fold_right(lambda: True, (lambda a, b: f(a) and b()))
+        return all(map(f, self))
 
     def filter(self, f: Callable[[A], bool]) -> Stream[A]:
-        def go(h: A, t: Callable[[], Stream[A]]) -> Stream[A]:
+        s = self
+        while isinstance(s, Cons):
+            h = s.head()
             if f(h):
-                return Cons(lambda: h, t)
-            else:
-                return t()
-
-        return self.fold_right(stream, go)
+                t = s.tail
+                return Cons(lambda: h, lambda: t().filter(f))
+            s = s.tail()
+        return empty()
 
     def append(self, sa: Callable[[], Stream[A]]) -> Stream[A]:
-        return self.fold_right(sa, (lambda h, t: Cons(lambda: h, t)))
+        match self:
+            case Cons(h, t):
+                return Cons(h, lambda: t().append(sa))
+            case _:
+                return sa()
 
     def flat_map(self, f: Callable[[A], Stream[B]]) -> Stream[B]:
-        return self.fold_right(stream, (lambda h, t: f(h).append(t)))
+        s = self
+        while isinstance(s, Cons):
+            bs = f(s.head())
+            if isinstance(bs, Cons):
+                t = s.tail
+                return bs.append(lambda: t().flat_map(f))
+            s = s.tail()
+        return empty()
+
+    # Sources. Each one produces its cells on demand, and because cells are memoized the underlying iterator is only
+    # advanced once per element, however many times the stream is traversed.
+    @staticmethod
+    def from_iterator(it: Iterator[A]) -> Stream[A]:
+        for a in it:
+            return Cons(lambda: a, lambda: Stream.from_iterator(it))
+        return empty()
+
+    @staticmethod
+    def from_iterable(xs: Iterable[A]) -> Stream[A]:
+        return Stream.from_iterator(iter(xs))
+
+    @staticmethod
+    def unfold(z: S, f: Callable[[S], Option[tuple[A, S]]]) -> Stream[A]:
+        match f(z):
+            case Some((a, s)):
+                return Cons(lambda: a, lambda: Stream.unfold(s, f))
+            case _:
+                return empty()
+
+    @staticmethod
+    def iterate(a: A, f: Callable[[A], A]) -> Stream[A]:
+        return Cons(lambda: a, lambda: Stream.iterate(f(a), f))
+
+    @staticmethod
+    def continually(a: Callable[[], A]) -> Stream[A]:
+        return Cons(a, lambda: Stream.continually(a))
+
+    @staticmethod
+    def range(start: int, stop: int, step: int = 1) -> Stream[int]:
+        return Stream.from_iterable(range(start, stop, step))
+
+    # The file is opened when the stream is created and closed once the last line has been read.
+    @staticmethod
+    def from_lines(path: str, encoding: str = 'utf-8') -> Stream[str]:
+        def lines() -> Iterator[str]:
+            with open(path, encoding=encoding) as f:
+                yield from f
+
+        return Stream.from_iterator(lines())
+
+    @staticmethod
+    def from_chunks(path: str, size: int = 1 << 16) -> Stream[bytes]:
+        def chunks() -> Iterator[bytes]:
+            with open(path, 'rb') as f:
+                yield from iter(lambda: f.read(size), b'')
+
+        return Stream.from_iterator(chunks())
+
+
+# Evaluates `thunk` the first time it is called and returns the cached value afterwards. The thunk is dropped once it
+# has run, so whatever it captured can be garbage collected.
+class _Memo(Generic[A]):
+    __slots__ = ('_thunk', '_value')
+
+    def __init__(self, thunk: Callable[[], A]) -> None:
+        self._thunk = thunk
+        self._value = None
+
+    def __call__(self) -> A:
+        if self._thunk is not None:
+            self._value = self._thunk()
+            self._thunk = None
+        return self._value
 
 
 @dataclass
@@ -99,9 +193,21 @@ class Cons(Stream[A]):
     head: Callable[[], A]
     tail: Callable[[], Stream[A]]
 
+    def __post_init__(self) -> None:
+        if not isinstance(self.head, _Memo):
+            self.head = _Memo(self.head)
+        if not isinstance(self.tail, _Memo):
+            self.tail = _Memo(self.tail)
+
 
 def stream(*elements: A) -> Stream[A]:
-    return Cons(lambda: elements[0], lambda: stream(*elements[1:])) if elements else empty()
+    return Stream.from_iterable(elements)
+
+
+def _elements(s: Stream[A]) -> Iterator[A]:
+    while isinstance(s, Cons):
+        yield s.head()
+        s = s.tail()
 
 
 def empty() -> Stream[A]:
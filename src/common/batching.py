@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Executor, Future
+from itertools import islice
+from typing import TypeVar, Callable, Iterable, Iterator
+
+A = TypeVar('A')
+B = TypeVar('B')
+
+
+def batches(xs: Iterable[A], size: int) -> Iterator[list[A]]:
+    it = iter(xs)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+# Runs `work` on each batch of `batch_size` elements of `xs` on `executor` and hands the results to `merge` in batch
+# order. Batches are read from `xs` only as workers become free: at most two per worker of `executor` are in flight at
+# a time, so the input can be larger than memory.
+def merge_batches(xs: Iterable[A], work: Callable[[list[A]], B], merge: Callable[[B], None], batch_size: int,
+                  executor: Executor) -> None:
+    in_flight = 2 * _workers(executor)
+    pending: deque[Future[B]] = deque()
+    for batch in batches(xs, batch_size):
+        pending.append(executor.submit(work, batch))
+        if len(pending) >= in_flight:
+            merge(pending.popleft().result())
+    while pending:
+        merge(pending.popleft().result())
+
+
+# `ThreadPoolExecutor` and `ProcessPoolExecutor` both keep their worker count in `_max_workers`. Other executors are
+# assumed to have one worker per CPU.
+def _workers(executor: Executor) -> int:
+    return getattr(executor, '_max_workers', None) or os.cpu_count() or 1
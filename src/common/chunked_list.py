@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from functools import reduce
+from itertools import chain, islice
+from typing import TypeVar, Generic, Callable, Iterable, Iterator, Optional
+
+from common.list import List, from_sequence
+
+A = TypeVar('A')
+B = TypeVar('B')
+
+
+# An alternative representation of `List` that stores its elements in immutable tuples ("chunks") instead of one
+# `Cons` cell per element. A list is a chunk, an offset of the first live element in that chunk, and the rest of the
+# list, which is shared between every list built on top of it. `tail` only moves the offset, so it stays O(1), and
+# bulk operations run over whole chunks with the C loops of `map`, `filter`, `reduce` and `tuple`.
+class ChunkedList(Generic[A]):
+    __slots__ = ('_chunk', '_offset', '_rest', '_size')
+
+    def __init__(self, chunk: tuple[A, ...], offset: int = 0, rest: Optional[ChunkedList[A]] = None) -> None:
+        self._chunk = chunk
+        self._offset = offset
+        self._rest = rest
+        self._size = len(chunk) - offset + (rest._size if rest else 0)
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[A]:
+        return chain.from_iterable(islice(chunk, offset, None) for chunk, offset in self._chunks())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ChunkedList):
+            return NotImplemented
+        return self._size == other._size and all(a == b for a, b in zip(self, other))
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __str__(self) -> str:
+        return '[' + ', '.join(str(a) for a in self) + ']'
+
+    def __repr__(self) -> str:
+        return f'chunked_list_of({", ".join(repr(a) for a in self)})'
+
+    def _chunks(self) -> Iterator[tuple[tuple[A, ...], int]]:
+        xs = self
+        while xs is not None and xs._size:
+            yield xs._chunk, xs._offset
+            xs = xs._rest
+
+    def head(self) -> A:
+        if not self:
+            raise Exception('head of empty list')
+        return self._chunk[self._offset]
+
+    def tail(self) -> ChunkedList[A]:
+        if not self:
+            raise Exception('tail of empty list')
+        if self._offset + 1 < len(self._chunk):
+            return ChunkedList(self._chunk, self._offset + 1, self._rest)
+        return self._rest if self._rest is not None else _EMPTY
+
+    def prepend(self, a: A) -> ChunkedList[A]:
+        return ChunkedList((a,), 0, self if self else None)
+
+    def fold(self, z: B, f: Callable[[B, A], B]) -> B:
+        return reduce(f, self, z)
+
+    def fold_right(self, z: B, f: Callable[[A, B], B]) -> B:
+        return reduce(lambda b, a: f(a, b), reversed(tuple(self)), z)
+
+    def map(self, f: Callable[[A], B]) -> ChunkedList[B]:
+        return chunked_list_from(map(f, self))
+
+    def filter(self, f: Callable[[A], bool]) -> ChunkedList[A]:
+        return chunked_list_from(filter(f, self))
+
+    def flat_map(self, f: Callable[[A], Iterable[B]]) -> ChunkedList[B]:
+        return chunked_list_from(chain.from_iterable(map(f, self)))
+
+    # Only the elements of `self` are copied; `r` becomes the shared rest of the result.
+    def append(self, r: ChunkedList[A]) -> ChunkedList[A]:
+        if not self:
+            return r
+        if not r:
+            return self
+        return ChunkedList(tuple(self), 0, r)
+
+    def reverse(self) -> ChunkedList[A]:
+        return chunked_list_from(tuple(self)[::-1])
+
+    def drop(self, n: int) -> ChunkedList[A]:
+        xs = self
+        while n > 0 and xs:
+            live = len(xs._chunk) - xs._offset
+            if n < live:
+                return ChunkedList(xs._chunk, xs._offset + n, xs._rest)
+            n -= live
+            xs = xs._rest if xs._rest is not None else _EMPTY
+        return xs
+
+    def sum(self) -> float | int:
+        return sum(self)
+
+    def to_python(self) -> list[A]:
+        return list(self)
+
+    def to_list(self) -> List[A]:
+        return from_sequence(tuple(self))
+
+
+def chunked_list_of(*elements: A) -> ChunkedList[A]:
+    return chunked_list_from(elements)
+
+
+def chunked_list_from(elements: Iterable[A]) -> ChunkedList[A]:
+    chunk = tuple(elements)
+    return ChunkedList(chunk) if chunk else _EMPTY
+
+
+def chunked_list_from_list(xs: List[A]) -> ChunkedList[A]:
+    return chunked_list_from(xs.to_python())
+
+
+_EMPTY: ChunkedList = ChunkedList(())
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import pickle
+import tempfile
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import TypeVar, Callable, Iterable, Iterator, Optional, Hashable
+
+from common.batching import merge_batches
+
+A = TypeVar('A')
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+# Grouping that consumes its input in a single pass, so it works the same on a `List`, a `Stream`, a generator or a
+# file. `group_by` keeps every element; `group_reduce` and `count_by` only keep one running value per key.
+
+def group_by(xs: Iterable[A], key: Callable[[A], K]) -> dict[K, list[A]]:
+    groups: dict[K, list[A]] = {}
+    for x in xs:
+        k = key(x)
+        group = groups.get(k)
+        if group is None:
+            groups[k] = [x]
+        else:
+            group.append(x)
+    return groups
+
+
+# Maps every element to a value and merges the values of each key with `combine`, in the order the elements come in.
+# The first value of a key is its starting point, so `combine` needs no identity.
+def group_reduce(xs: Iterable[A], key: Callable[[A], K], value: Callable[[A], V],
+                 combine: Callable[[V, V], V]) -> dict[K, V]:
+    totals: dict[K, V] = {}
+    for x in xs:
+        k = key(x)
+        total = totals.get(k, _MISSING)
+        totals[k] = value(x) if total is _MISSING else combine(total, value(x))
+    return totals
+
+
+def count_by(xs: Iterable[A], key: Callable[[A], K]) -> Counter[K]:
+    return Counter(map(key, xs))
+
+
+_MISSING = object()
+
+
+# `group_reduce` with a bound on memory. Once the running values of `max_keys` keys are held, they are written out to
+# `partitions` temporary files, chosen by the hash of the key, and the table starts over. At the end each file is
+# reduced on its own, so only about `1 / partitions` of the keys are in memory at a time. The partial values of a key
+# are merged in the order they were written, so `combine` must be associative. Keys and values must be picklable.
+#
+# The results are yielded as `(key, value)` pairs instead of being collected into a dictionary. If the input never
+# has more than `max_keys` keys, nothing is written to disk.
+def group_reduce_spilling(xs: Iterable[A], key: Callable[[A], K], value: Callable[[A], V],
+                          combine: Callable[[V, V], V], max_keys: int = 1_000_000, partitions: int = 16,
+                          directory: Optional[str] = None) -> Iterator[tuple[K, V]]:
+    totals: dict[K, V] = {}
+    files = None
+    try:
+        for x in xs:
+            k = key(x)
+            total = totals.get(k, _MISSING)
+            if total is _MISSING:
+                if len(totals) >= max_keys:
+                    files = files or [tempfile.TemporaryFile(dir=directory) for _ in range(partitions)]
+                    _spill(totals, files)
+                    totals = {}
+                totals[k] = value(x)
+            else:
+                totals[k] = combine(total, value(x))
+        if files is None:
+            yield from totals.items()
+            return
+        _spill(totals, files)
+        totals = {}
+        for file in files:
+            file.seek(0)
+            partition: dict[K, V] = {}
+            for part in _read_spilled(file):
+                _merge_into(partition, part, combine)
+            yield from partition.items()
+    finally:
+        for file in files or ():
+            file.close()
+
+
+def _spill(totals: dict[K, V], files: list) -> None:
+    parts: list[dict[K, V]] = [{} for _ in files]
+    for k, v in totals.items():
+        parts[hash(k) % len(files)][k] = v
+    for file, part in zip(files, parts):
+        if part:
+            pickle.dump(part, file, pickle.HIGHEST_PROTOCOL)
+
+
+def _read_spilled(file) -> Iterator[dict[K, V]]:
+    while True:
+        try:
+            yield pickle.load(file)
+        except EOFError:
+            return
+
+
+# `group_reduce` over batches of `batch_size` elements on `executor` (a new `ProcessPoolExecutor` by default). Each
+# batch is reduced in a worker, and the partial results are merged here in batch order, so `combine` must be
+# associative. With a process pool `key`, `value` and `combine` must be picklable, so not lambdas. Batches are read
+# from `xs` only as workers become free (see `merge_batches`).
+def par_group_reduce(xs: Iterable[A], key: Callable[[A], K], value: Callable[[A], V], combine: Callable[[V, V], V],
+                     batch_size: int = 100_000, executor: Optional[Executor] = None) -> dict[K, V]:
+    if executor is None:
+        with ProcessPoolExecutor() as pool:
+            return par_group_reduce(xs, key, value, combine, batch_size, pool)
+    totals: dict[K, V] = {}
+    work = partial(group_reduce, key=key, value=value, combine=combine)
+    merge_batches(xs, work, partial(_merge_into, totals, combine=combine), batch_size, executor)
+    return totals
+
+
+def _merge_into(totals: dict[K, V], part: dict[K, V], combine: Callable[[V, V], V]) -> None:
+    for k, v in part.items():
+        total = totals.get(k, _MISSING)
+        totals[k] = v if total is _MISSING else combine(total, v)
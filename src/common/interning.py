@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import TypeVar, Generic, Callable, Hashable
+from weakref import WeakValueDictionary
+
+N = TypeVar('N')
+
+
+# A hash-consing table: `intern` returns the canonical node for `key`, building it with `make` the first time. Nodes
+# are held weakly, so an entry disappears as soon as nothing else refers to its node.
+#
+# Node factories key their children by `id`, which is safe because a canonical node keeps its children alive for as
+# long as its entry exists.
+class Interner(Generic[N]):
+    def __init__(self) -> None:
+        self._table: WeakValueDictionary[Hashable, N] = WeakValueDictionary()
+
+    def intern(self, key: Hashable, make: Callable[[], N]) -> N:
+        node = self._table.get(key)
+        if node is None:
+            node = make()
+            self._table[key] = node
+        return node
+
+    def __len__(self) -> int:
+        return len(self._table)
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TypeVar, Generic, Callable
+from dataclasses import dataclass, field
+from functools import reduce
+from itertools import chain, islice, takewhile, dropwhile
+from typing import TypeVar, Generic, Callable, Iterator, Iterable, Sequence
 
-from common.tail_call import TailCall, Return, Suspend
+from common import grouping, matching
+from common.interning import Interner
+from common.tail_call import TailCall, Return, Suspend, tailrec
 
 A = TypeVar('A')
 B = TypeVar('B')
@@ -12,6 +16,8 @@ Nothing = TypeVar('Nothing')
 
 
 class List(Generic[A]):
+    __slots__ = ()
+
     def __bool__(self) -> bool:
         return isinstance(self, Cons)
 
@@ -19,7 +25,14 @@ class List(Generic[A]):
         return self.fold_right(r, (lambda h, t: Cons(h, t)))
 
     def fold_right(self, z: B, f: Callable[[A, B], B]) -> B:
-        return self.fold(lambda b: b, (lambda g, a: lambda b: g(f(a, b))))(z)
+        def go(xs: List[A]) -> TailCall[B]:
+            match xs:
+                case Nil():
+                    return Return(z)
+                case Cons(h, t):
+                    return Suspend(lambda: go(t)).map(lambda b: f(h, b))
+
+        return go(self).eval()
 
     def tail(self) -> List[A]:
         match self:
@@ -43,7 +56,8 @@ class List(Generic[A]):
                 return Cons(h, t)
 
     def drop(self, n: int) -> List[A]:
-        def go(xs: List[A], p: int) -> TailCall[List[A]]:
+        @tailrec
+        def go(xs: List[A], p: int) -> Return[List[A]] | tuple:
             if p <= 0:
                 return Return(xs)
             else:
@@ -51,9 +65,9 @@ class List(Generic[A]):
                     case Nil():
                         return Return(xs)
                     case Cons(_, t):
-                        return Suspend(lambda: go(t, p - 1))
+                        return t, p - 1
 
-        return go(self, n).eval()
+        return go(self, n)
 
     def drop_while(self, f: Callable[[A], bool]) -> List[A]:
         match self:
@@ -63,26 +77,36 @@ class List(Generic[A]):
                 return self
 
     def init(self) -> List[A]:
-        match self:
-            case Nil():
-                raise Exception('init of empty list')
-            case Cons(_, Nil()):
-                return Nil()
-            case Cons(h, t):
-                return Cons(h, t.init())
+        def go(xs: List[A]) -> TailCall[List[A]]:
+            match xs:
+                case Cons(_, Nil()):
+                    return Return(Nil())
+                case Cons(h, t):
+                    return Suspend(lambda: go(t)).map(lambda r: Cons(h, r))
+
+        if not self:
+            raise Exception('init of empty list')
+        return go(self).eval()
 
     def __len__(self) -> int:
-        return self.fold(0, (lambda acc, h: acc + 1))
+        return self._size
+
+    def __iter__(self) -> Iterator[A]:
+        xs = self
+        while isinstance(xs, Cons):
+            yield xs._head
+            xs = xs._tail
 
     def fold(self, z: B, f: Callable[[B, A], B]) -> B:
-        def go(xs: List[A], b: B, g: Callable[[B, A], B]) -> TailCall[B]:
+        @tailrec
+        def go(xs: List[A], b: B, g: Callable[[B, A], B]) -> Return[B] | tuple:
             match xs:
                 case Nil():
                     return Return(b)
                 case Cons(h, t):
-                    return Suspend(lambda: go(t, g(b, h), g))
+                    return t, g(b, h), g
 
-        return go(self, z, f).eval()
+        return go(self, z, f)
 
     def reverse(self) -> List[A]:
         return self.fold(empty_list(), (lambda acc, h: Cons(h, acc)))
@@ -107,13 +131,17 @@ class List(Generic[A]):
         return List.concat(self.map(f))
 
     def zip_with(self, b: List[B], f: Callable[[A, B], C]) -> List[C]:
-        match (self, b):
-            case (Nil(), _):
-                return Nil()
-            case (_, Nil()):
-                return Nil()
-            case (Cons(h1, t1), Cons(h2, t2)):
-                return Cons(f(h1, h2), t1.zip_with(t2, f))
+        def go(xs: List[A], ys: List[B]) -> TailCall[List[C]]:
+            match (xs, ys):
+                case (Nil(), _):
+                    return Return(Nil())
+                case (_, Nil()):
+                    return Return(Nil())
+                case (Cons(h1, t1), Cons(h2, t2)):
+                    c = f(h1, h2)
+                    return Suspend(lambda: go(t1, t2)).map(lambda r: Cons(c, r))
+
+        return go(self, b).eval()
 
     def starts_with(self, prefix: List[A]) -> bool:
         def go(xs: List[A], pre: List[A]) -> TailCall[bool]:
@@ -127,31 +155,21 @@ class List(Generic[A]):
 
         return go(self, prefix).eval()
 
+    # Checking `starts_with` at every position is O(n * m) in the worst case; `matching.contains` scans `self` once.
     def has_subsequence(self, subsequence: List[A]) -> bool:
-        def go(sup: List[A], sub: List[A]) -> TailCall[bool]:
-            match sup:
-                case Nil():
-                    return Return(sub == Nil)
-                case _ if sup.starts_with(sub):
-                    return Return(True)
-                case Cons(_, t):
-                    return Suspend(lambda: go(t, sub))
+        return matching.contains(self, tuple(subsequence))
 
-        return go(self, subsequence).eval()
+    # Finds every occurrence of every pattern in a single pass, as a list of `(position, pattern index)` pairs ordered
+    # by where each occurrence ends. The elements must be hashable.
+    def find_subsequences(self, *patterns: List[A]) -> List[tuple[int, int]]:
+        return from_iterable(matching.MultiPatternMatcher(tuple(p) for p in patterns).find(self))
 
+    # One pass over the cells collects each group, and each group is then built into a `List` back to front.
     def group_by(self, key_selector: Callable[[A], B]) -> dict[B, List[A]]:
-        xs: list[A] = self.to_python()
-        xs.reverse()
-        dictionary: dict[A, List[A]] = {}
-        for x in xs:
-            key = key_selector(x)
-            list_in_dict = dictionary.get(key)
-            if list_in_dict:
-                dictionary[key] = Cons(x, list_in_dict)
-            else:
-                dictionary[key] = Cons(x, Nil())
+        return {key: from_sequence(xs) for key, xs in grouping.group_by(self, key_selector).items()}
 
-        return dictionary
+    def view(self) -> ListView[A]:
+        return ListView(self)
 
     def __str__(self) -> str:
         if isinstance(self, Nil):
@@ -163,42 +181,224 @@ class List(Generic[A]):
             return first + remaining + ']'
 
     def to_python(self) -> list[A]:
-        def go(b: list[A], a: A) -> list[A]:
-            b.append(a)
-            return b
-
-        return self.fold(list(), go)
+        return list(self)
 
     def sum(self) -> float | int:
         match self:
             case Nil():
                 return 0
             case Cons(h, t) if isinstance(h, int) or isinstance(h, float):
-                return self.fold(0, (lambda b, a: b + a))
+                return sum(self)
             case _:
                 raise RuntimeError('Sum is not supported for non-numeric values')
 
 
 def list_of(*elements: A) -> List[A]:
-    if len(elements) == 0:
-        return Nil()
-    else:
-        return Cons(elements[0], list_of(*elements[1:]))
+    return from_sequence(elements)
+
+
+# Builds the list back to front in a single pass, so each element costs one `Cons` and nothing is copied.
+def from_sequence(elements: Sequence[A]) -> List[A]:
+    xs: List[A] = Nil()
+    for a in reversed(elements):
+        xs = Cons(a, xs)
+    return xs
+
+
+def from_iterable(elements: Iterable[A]) -> List[A]:
+    return from_sequence(elements if isinstance(elements, Sequence) else list(elements))
+
+
+# Collects elements front to back, for code that produces a list incrementally, and builds the `List` once at the end.
+class ListBuilder(Generic[A]):
+    def __init__(self) -> None:
+        self._buffer: list[A] = []
+
+    def append(self, a: A) -> ListBuilder[A]:
+        self._buffer.append(a)
+        return self
+
+    def extend(self, elements: Iterable[A]) -> ListBuilder[A]:
+        self._buffer.extend(elements)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def result(self) -> List[A]:
+        return from_sequence(self._buffer)
+
+
+# A lazy pipeline over a `List`. `map`, `filter`, `flat_map`, `take`, `drop`, `take_while` and `drop_while` only record
+# a stage; the terminal operations (`fold`, `to_python`, `to_list`, `sum`, `group_by`, iteration) run all stages
+# fused in a single pass over the source, without building an intermediate list per stage.
+class ListView(Generic[A]):
+    def __init__(self, source: Iterable[A], stages: tuple[Callable[[Iterator], Iterator], ...] = ()) -> None:
+        self._source = source
+        self._stages = stages
+
+    def _then(self, stage: Callable[[Iterator[A]], Iterator[B]]) -> ListView[B]:
+        return ListView(self._source, self._stages + (stage,))
+
+    def map(self, f: Callable[[A], B]) -> ListView[B]:
+        return self._then(lambda it: map(f, it))
+
+    def filter(self, f: Callable[[A], bool]) -> ListView[A]:
+        return self._then(lambda it: filter(f, it))
+
+    def flat_map(self, f: Callable[[A], Iterable[B]]) -> ListView[B]:
+        return self._then(lambda it: chain.from_iterable(map(f, it)))
+
+    def take(self, n: int) -> ListView[A]:
+        return self._then(lambda it: islice(it, max(n, 0)))
+
+    def drop(self, n: int) -> ListView[A]:
+        return self._then(lambda it: islice(it, max(n, 0), None))
+
+    def take_while(self, f: Callable[[A], bool]) -> ListView[A]:
+        return self._then(lambda it: takewhile(f, it))
+
+    def drop_while(self, f: Callable[[A], bool]) -> ListView[A]:
+        return self._then(lambda it: dropwhile(f, it))
+
+    def __iter__(self) -> Iterator[A]:
+        it = iter(self._source)
+        for stage in self._stages:
+            it = stage(it)
+        return it
+
+    def fold(self, z: B, f: Callable[[B, A], B]) -> B:
+        return reduce(f, self, z)
+
+    def to_python(self) -> list[A]:
+        return list(self)
+
+    def to_list(self) -> List[A]:
+        return from_iterable(self)
+
+    def sum(self) -> float | int:
+        return sum(self)
+
+    def group_by(self, key_selector: Callable[[A], B]) -> dict[B, List[A]]:
+        return {key: from_sequence(xs) for key, xs in grouping.group_by(self, key_selector).items()}
 
 
 def empty_list() -> List[Nothing]:
     return Nil()
 
 
-@dataclass(frozen=True)
+# `Nil` is a singleton: every `Nil()` returns the same instance.
+@dataclass(frozen=True, slots=True)
 class Nil(List[Nothing]):
-    pass
-
-
-@dataclass(frozen=True)
+    _size = 0
+    _instance = None
+
+    def __new__(cls) -> Nil:
+        if cls._instance is None:
+            cls._instance = object.__new__(cls)
+        return cls._instance
+
+
+# Each cell caches the length of the list it starts, so `len` is O(1). The fields are written through their slot
+# descriptors, which is much cheaper than the `object.__setattr__` calls of a generated frozen `__init__`.
+#
+# `__eq__` and `__hash__` walk the cells in a loop rather than recursing through the tail. Only interned cells (see
+# `interned_cons`) have room to cache their hash and to be weakly referenced; a plain cell reads the class-level
+# `_hash = None`, so it pays nothing for interning. Two lists with different cached hashes are unequal without
+# comparing any elements, and shared tails compare by identity.
+#
+# A list pickles and copies as the tuple of its elements, which leaves out the cached hash (it differs between
+# processes for `str` elements) and doesn't recurse once per cell.
+@dataclass(frozen=True, slots=True, init=False)
 class Cons(List[A]):
     _head: A
     _tail: List[A]
+    _size: int = field(init=False, repr=False, compare=False)
+    _hash = None
+
+    def __init__(self, head: A, tail: List[A]) -> None:
+        _set_head(self, head)
+        _set_tail(self, tail)
+        _set_size(self, tail._size + 1)
+
+    def __reduce__(self):
+        return from_sequence, (tuple(self),)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Cons):
+            return NotImplemented
+        a, b = self, other
+        if a._size != b._size:
+            return False
+        while isinstance(a, Cons):
+            if a is b:
+                return True
+            ha, hb = a._hash, b._hash
+            if ha is not None and hb is not None and ha != hb:
+                return False
+            if not (a._head is b._head or a._head == b._head):
+                return False
+            a, b = a._tail, b._tail
+        return True
+
+    def __hash__(self) -> int:
+        if self._hash is not None:
+            return self._hash
+        unhashed: list[Cons[A]] = []
+        xs = self
+        while isinstance(xs, Cons) and xs._hash is None:
+            unhashed.append(xs)
+            xs = xs._tail
+        h = hash(xs)
+        for cell in reversed(unhashed):
+            h = hash((cell._head, h))
+            if type(cell) is _InternedCons:
+                _set_hash(cell, h)
+        return h
+
+
+_set_head = Cons._head.__set__
+_set_tail = Cons._tail.__set__
+_set_size = Cons._size.__set__
+
+
+# The cells `interned_cons` creates: a `Cons` with a slot for its cached hash and one for weak references, which the
+# intern table needs. They print like any other `Cons`.
+class _InternedCons(Cons[A]):
+    __slots__ = ('_hash', '__weakref__')
+
+    def __init__(self, head: A, tail: List[A]) -> None:
+        _set_head(self, head)
+        _set_tail(self, tail)
+        _set_size(self, tail._size + 1)
+        _set_hash(self, None)
+
+    def __repr__(self) -> str:
+        return f'Cons(_head={self._head!r}, _tail={self._tail!r})'
+
+
+_set_hash = _InternedCons._hash.__set__
+
+
+_CONS_TABLE: Interner[Cons] = Interner()
+
+
+# Hash-consing constructor: returns the canonical cell for `head` in front of `tail`, so equal lists built through it
+# share their cells and compare by identity. `head` must be hashable and `tail` should itself be interned (or `Nil`).
+def interned_cons(head: A, tail: List[A]) -> List[A]:
+    return _CONS_TABLE.intern((type(head), head, id(tail)), lambda: _hashed(_InternedCons(head, tail)))
+
+
+def intern_list(xs: List[A]) -> List[A]:
+    interned: List[A] = Nil()
+    for a in reversed(xs.to_python()):
+        interned = interned_cons(a, interned)
+    return interned
+
+
+def _hashed(xs: Cons[A]) -> Cons[A]:
+    hash(xs)
+    return xs
 
 
 def curry(f: Callable[[A, B], C]) -> Callable[[A], Callable[[B], C]]:
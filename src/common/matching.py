@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import TypeVar, Generic, Iterable, Iterator, Sequence, Hashable
+
+A = TypeVar('A')
+H = TypeVar('H', bound=Hashable)
+
+
+# Searching a sequence for a contiguous run of elements ("pattern"). Trying the pattern at every position costs
+# O(n * m) comparisons in the worst case; the matchers here look at each element of the text once, in O(n + m), and
+# consume the text as an iterator, so it can be a `List`, a generator or a stream.
+
+# Knuth-Morris-Pratt. `fallback[i]` is the length of the longest proper prefix of `pattern[:i + 1]` that is also a
+# suffix of it: after a mismatch following `i + 1` matched elements, the search continues as if only that many had
+# matched. Elements are only compared with `==`, so they don't need to be hashable.
+def _fallback(pattern: Sequence[A]) -> list[int]:
+    table = [0] * len(pattern)
+    k = 0
+    for i in range(1, len(pattern)):
+        while k and pattern[i] != pattern[k]:
+            k = table[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        table[i] = k
+    return table
+
+
+# Yields the start position of every occurrence of `pattern` in `text`, overlapping ones included. The empty pattern
+# occurs at every position, including the end of the text.
+def find(text: Iterable[A], pattern: Sequence[A]) -> Iterator[int]:
+    m = len(pattern)
+    if m == 0:
+        yield 0
+        for i, _ in enumerate(text, 1):
+            yield i
+        return
+    table = _fallback(pattern)
+    k = 0
+    for i, a in enumerate(text):
+        while k and a != pattern[k]:
+            k = table[k - 1]
+        if a == pattern[k]:
+            k += 1
+            if k == m:
+                yield i - m + 1
+                k = table[k - 1]
+
+
+def contains(text: Iterable[A], pattern: Sequence[A]) -> bool:
+    return next(find(text, pattern), None) is not None
+
+
+# Aho-Corasick: searches for many patterns in one pass over the text. The patterns are stored in a trie whose nodes
+# are dictionaries, so elements must be hashable. Each node also has a fallback link to the node of its longest proper
+# suffix that is in the trie, and lists the patterns that end there, directly or through its fallbacks.
+class MultiPatternMatcher(Generic[H]):
+    def __init__(self, patterns: Iterable[Sequence[H]]) -> None:
+        self._patterns = [tuple(p) for p in patterns]
+        self._children: list[dict[H, int]] = [{}]
+        self._outputs: list[list[int]] = [[]]
+        for index, pattern in enumerate(self._patterns):
+            node = 0
+            for a in pattern:
+                nxt = self._children[node].get(a)
+                if nxt is None:
+                    nxt = len(self._children)
+                    self._children[node][a] = nxt
+                    self._children.append({})
+                    self._outputs.append([])
+                node = nxt
+            self._outputs[node].append(index)
+        self._fallbacks = [0] * len(self._children)
+        pending = deque([0])
+        while pending:
+            node = pending.popleft()
+            for a, child in self._children[node].items():
+                pending.append(child)
+                fallback = 0
+                if node:
+                    f = self._fallbacks[node]
+                    while f and a not in self._children[f]:
+                        f = self._fallbacks[f]
+                    fallback = self._children[f].get(a, 0)
+                self._fallbacks[child] = fallback
+                self._outputs[child].extend(self._outputs[fallback])
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    # Yields `(position, pattern index)` for every occurrence of every pattern, ordered by where the occurrence ends,
+    # then from longest to shortest pattern.
+    def find(self, text: Iterable[H]) -> Iterator[tuple[int, int]]:
+        children, fallbacks, outputs, patterns = self._children, self._fallbacks, self._outputs, self._patterns
+        for index in outputs[0]:
+            yield 0, index
+        node = 0
+        for i, a in enumerate(text, 1):
+            while node and a not in children[node]:
+                node = fallbacks[node]
+            node = children[node].get(a, 0)
+            for index in outputs[node]:
+                yield i - len(patterns[index]), index
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import decimal
+from itertools import repeat
+from numbers import Number
+from operator import sub
+from typing import Iterable, Optional, Sized
+
+
+# Reductions over numbers that run inside the C loops of `sum` and `map` instead of calling a Python function per
+# element. They only rely on `+`, `-`, `** 2` and `/`, so they work the same for `int`, `float`, `Decimal` or
+# `Fraction`.
+#
+# Anything with a `len` (a `list`, a `tuple`, a `List`) is iterated in place; other iterables are copied into a list
+# first, since they can only be read once.
+def mean(values: Iterable[Number]) -> Number:
+    xs = values if isinstance(values, Sized) else list(values)
+    return sum(xs) / len(xs)
+
+
+# The population variance. `m` can be passed in when the mean of `values` is already known. The squared deviations are
+# summed as they are produced, so no list of them is built.
+def variance(values: Iterable[Number], m: Optional[Number] = None) -> Number:
+    xs = values if isinstance(values, Sized) else list(values)
+    if m is None:
+        m = sum(xs) / len(xs)
+    return sum(map(pow, map(sub, xs, repeat(m)), repeat(2))) / len(xs)
+
+
+# The decimal digits of `n`. `str` converts integers in time quadratic in their length, and refuses ones with more
+# than 4300 digits unless `sys.set_int_max_str_digits` is raised. Here `n` is split into halves of its bits, the halves
+# are converted separately and recombined as `hi * 2**k + lo` in `decimal`, whose multiplication is fast for huge
+# numbers. Converting a 450,000 digit number takes about 0.2s instead of 4s.
+def to_decimal_string(n: int) -> str:
+    if n.bit_length() <= _SMALL_BITS:
+        return str(n)
+    context = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX)
+    powers: dict[int, decimal.Decimal] = {}
+
+    def go(m: int, bits: int) -> decimal.Decimal:
+        if bits <= _SMALL_BITS:
+            return decimal.Decimal(m)
+        k = bits // 2
+        if k not in powers:
+            powers[k] = context.power(decimal.Decimal(2), k)
+        hi = m >> k
+        return context.add(context.multiply(go(hi, bits - k), powers[k]), go(m - (hi << k), k))
+
+    digits = str(go(abs(n), abs(n).bit_length()))
+    return '-' + digits if n < 0 else digits
+
+
+_SMALL_BITS = 3000
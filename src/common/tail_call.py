@@ -1,16 +1,37 @@
+from __future__ import annotations
+
 from abc import ABC
 from dataclasses import dataclass
-from typing import TypeVar, Generic, Callable
+from functools import wraps
+from typing import TypeVar, Generic, Callable, Any
 
 T = TypeVar('T')
+U = TypeVar('U')
 
 
 class TailCall(Generic[T], ABC):
+    # The continuations of pending `flat_map`s are kept on an explicit stack, so non-tail recursion such as
+    # `go(t).map(lambda b: f(h, b))` is evaluated in a single loop without growing the Python stack.
     def eval(self) -> T:
+        continuations: list[Callable[[Any], TailCall[Any]]] = []
         tail_rec = self
-        while isinstance(tail_rec, Suspend):
-            tail_rec = tail_rec.resume()
-        return tail_rec.eval()
+        while True:
+            kind = type(tail_rec)
+            if kind is Suspend:
+                tail_rec = tail_rec.resume_function()
+            elif kind is FlatMap:
+                continuations.append(tail_rec.f)
+                tail_rec = tail_rec.sub
+            elif continuations:
+                tail_rec = continuations.pop()(tail_rec.t)
+            else:
+                return tail_rec.t
+
+    def flat_map(self, f: Callable[[T], TailCall[U]]) -> TailCall[U]:
+        return FlatMap(self, f)
+
+    def map(self, f: Callable[[T], U]) -> TailCall[U]:
+        return FlatMap(self, lambda t: Return(f(t)))
 
 
 @dataclass
@@ -27,3 +48,27 @@ class Suspend(TailCall[T]):
 
     def resume(self) -> TailCall[T]:
         return self.resume_function()
+
+
+@dataclass
+class FlatMap(TailCall[U]):
+    sub: TailCall[T]
+    f: Callable[[T], TailCall[U]]
+
+
+# A second, allocation-light trampoline. Instead of returning `Suspend(lambda: go(...))`, the decorated function
+# returns the tuple of arguments for its next iteration, and `Return(value)` when it is done. The decorator turns the
+# "recursion" into a plain `while` loop, so no closure or `Suspend` object is created per step.
+#
+#   @tailrec
+#   def go(xs: List[A], acc: B) -> Return[B] | tuple:
+#       return Return(acc) if not xs else (xs.tail(), acc + xs.head())
+def tailrec(f: Callable[..., Return[T] | tuple]) -> Callable[..., T]:
+    @wraps(f)
+    def loop(*args) -> T:
+        result = f(*args)
+        while type(result) is tuple:
+            result = f(*result)
+        return result.t
+
+    return loop
@@ -1,4 +1,13 @@
-from chapter01.cafe import buy_coffees, CreditCard, Charge, coalesce, Coffee
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+
+from chapter01.cafe import buy_coffees, CreditCard, Charge, coalesce, Coffee, ChargeCoalescer, coalesce_sharded
+
+
+@dataclass(frozen=True)
+class Card(CreditCard):
+    number: int
 
 
 def test_buy_coffees() -> None:
@@ -10,3 +19,57 @@ def test_buy_coffees() -> None:
 def test_coalesce() -> None:
     charges = [Charge(CreditCard(), 5.0), Charge(CreditCard(), 2.0)]
     assert coalesce(charges) == [Charge(CreditCard(), 7.0)]
+
+
+def test_coalesce_unsorted() -> None:
+    a, b = Card(1), Card(2)
+    charges = [Charge(a, 1.0), Charge(b, 2.0), Charge(a, 3.0), Charge(b, 4.0), Charge(a, 5.0)]
+    assert coalesce(charges) == [Charge(a, 9.0), Charge(b, 6.0)]
+    assert coalesce([]) == []
+
+
+def test_charge_coalescer() -> None:
+    a, b = Card(1), Card(2)
+    coalescer = ChargeCoalescer().add(Charge(b, 1.0))
+    coalescer.extend(Charge(a if i % 2 else b, 1.0) for i in range(10))
+    assert len(coalescer) == 2
+    assert coalescer.charges() == [Charge(b, 6.0), Charge(a, 5.0)]
+
+
+def test_coalesce_sharded() -> None:
+    charges = [Charge(Card(i % 7), 1.0) for i in range(1000)]
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert coalesce_sharded(charges, batch_size=100, executor=pool) == coalesce(charges)
+
+
+class DeferredFuture(Future):
+    def __init__(self, fn, args) -> None:
+        super().__init__()
+        self.fn, self.args = fn, args
+
+    def result(self, timeout=None):
+        if not self.done():
+            self.set_result(self.fn(*self.args))
+        return super().result(timeout)
+
+
+# Runs each task only when its result is asked for, and records how many tasks were outstanding at each `submit`.
+class DeferredExecutor(Executor):
+    def __init__(self) -> None:
+        self.futures = []
+        self.outstanding = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.outstanding.append(sum(not f.done() for f in self.futures))
+        self.futures.append(DeferredFuture(fn, args))
+        return self.futures[-1]
+
+
+def test_coalesce_sharded_bounds_batches_in_flight() -> None:
+    charges = (Charge(Card(i % 3), 1.0) for i in range(10000))
+    executor = DeferredExecutor()
+    assert coalesce_sharded(charges, batch_size=10, executor=executor) == [Charge(Card(0), 3334.0),
+                                                                            Charge(Card(1), 3333.0),
+                                                                            Charge(Card(2), 3333.0)]
+    assert len(executor.futures) == 1000
+    assert max(executor.outstanding) < 2 * (os.cpu_count() or 1)
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+from dataclasses import dataclass, field
+
+from chapter01.cafe import Charge, CreditCard, Payments
+from chapter01.settlement import SettlementPipeline, settle
+
+
+@dataclass(frozen=True)
+class Card(CreditCard):
+    number: int
+
+
+@dataclass(frozen=True)
+class FakePayments(Payments):
+    calls: list = field(default_factory=list)
+
+    def charge(self, cc: CreditCard, price: float) -> None:
+        self.calls.append((cc, price))
+
+
+def test_settle_by_size() -> None:
+    payments = FakePayments()
+    charges = [Charge(Card(i % 3), 1.0) for i in range(1000)]
+    asyncio.run(settle(charges, payments, window_size=100, max_pending=10))
+    assert len(payments.calls) == 30
+    assert sum(price for _, price in payments.calls) == 1000.0
+    assert {cc for cc, _ in payments.calls} == {Card(0), Card(1), Card(2)}
+
+
+def test_settle_by_time() -> None:
+    payments = FakePayments()
+
+    async def run() -> None:
+        async with SettlementPipeline(payments, window_size=1000, window_time=0.01) as pipeline:
+            await pipeline.submit(Charge(Card(1), 2.0))
+            await pipeline.submit(Charge(Card(1), 3.0))
+            await asyncio.sleep(0.1)
+            assert payments.calls == [(Card(1), 5.0)]
+            await pipeline.submit(Charge(Card(2), 1.0))
+
+    asyncio.run(run())
+    assert payments.calls == [(Card(1), 5.0), (Card(2), 1.0)]
+
+
+def test_settle_async_source() -> None:
+    payments = FakePayments()
+
+    async def source():
+        for i in range(10):
+            yield Charge(Card(i % 2), 1.0)
+
+    asyncio.run(settle(source(), payments))
+    assert payments.calls == [(Card(0), 5.0), (Card(1), 5.0)]
+
+
+@dataclass(frozen=True)
+class FailingPayments(Payments):
+    def charge(self, cc: CreditCard, price: float) -> None:
+        time.sleep(0.2)
+        raise ConnectionError('gateway down')
+
+
+def test_backend_failure() -> None:
+    charges = [Charge(Card(i), 1.0) for i in range(100)]
+    with pytest.raises(ConnectionError):
+        asyncio.run(asyncio.wait_for(settle(charges, FailingPayments(), window_size=5, max_pending=3), 5))
+
+
+def test_lifecycle_errors() -> None:
+    async def run() -> None:
+        pipeline = SettlementPipeline(FakePayments())
+        with pytest.raises(RuntimeError, match='not been started'):
+            await pipeline.submit(Charge(Card(1), 1.0))
+        with pytest.raises(RuntimeError, match='not been started'):
+            await pipeline.close()
+        pipeline.start()
+        await pipeline.close()
+        with pytest.raises(RuntimeError, match='closed'):
+            await pipeline.submit(Charge(Card(1), 1.0))
+
+    asyncio.run(run())
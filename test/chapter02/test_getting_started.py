@@ -0,0 +1,27 @@
+import math
+
+from chapter02.my_module import factorial, factorial2, fib, format_result, absolute_value
+from common.numeric import to_decimal_string
+
+
+def test_absolute_value() -> None:
+    assert absolute_value(-42) == 42
+
+
+def test_factorial() -> None:
+    assert [factorial(n) for n in range(8)] == [1, 1, 2, 6, 24, 120, 720, 5040]
+    assert factorial(-1) == 1
+    assert factorial(1000) == factorial2(1000) == math.factorial(1000)
+
+
+def test_fib() -> None:
+    assert [fib(n) for n in range(10)] == [0, 1, 1, 2, 3, 5, 8, 13, 21, 34]
+    a, b = 0, 1
+    for _ in range(1000):
+        a, b = b, a + b
+    assert fib(1000) == a
+
+
+def test_format_result() -> None:
+    assert format_result('factorial', 5, factorial) == 'The factorial of 5 is 120.'
+    assert format_result('factorial', 5000, factorial).endswith(to_decimal_string(factorial(5000)) + '.')
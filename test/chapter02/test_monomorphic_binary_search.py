@@ -1,8 +1,16 @@
-from chapter02.monomorphic_binary_search import find_first, binary_search
+from chapter02.monomorphic_binary_search import find_first, binary_search, insertion_points
 
 
 def test_binary_search() -> None:
     assert binary_search([1.3, 2.8, 3.1, 4.1, 5.2], 4.1) == 3
+    assert binary_search([1.3, 2.8, 3.1, 4.1, 5.2], 0.5) == -1
+    assert binary_search([], 0.5) == -1
+
+
+def test_insertion_points() -> None:
+    ds = [1.3, 2.8, 3.1, 4.1, 5.2]
+    assert insertion_points(ds, [4.1, 0.5, 3.0, 9.9, 1.3]) == [3, 0, 2, 5, 0]
+    assert insertion_points(ds, []) == []
 
 
 def test_find_first() -> None:
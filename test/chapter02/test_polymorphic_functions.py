@@ -1,8 +1,17 @@
-from chapter02.polymorphic_functions import find_first, is_sorted, partial1, curry, uncurry, compose, binary_search
+from chapter02.polymorphic_functions import find_first, is_sorted, partial1, curry, uncurry, compose, binary_search, \
+    insertion_points, SearchIndex
 
 
 def test_binary_search() -> None:
     assert binary_search([1, 2, 3, 4, 5], 4, (lambda a, b: a > b)) == 3
+    assert binary_search([1, 2, 3, 4, 5], 6, (lambda a, b: a > b)) == -5
+
+
+def test_insertion_points() -> None:
+    by_length = (lambda a, b: len(a) > len(b))
+    xs = ['a', 'bb', 'bb', 'ccc', 'eeeee']
+    assert insertion_points(xs, ['dddd', 'xx', '', 'ffffff', 'a'], by_length) == [4, 1, 0, 5, 0]
+    assert insertion_points([], ['a'], by_length) == [0]
 
 
 def test_find_first() -> None:
@@ -12,10 +21,48 @@ def test_find_first() -> None:
     assert find_first([6, 5, 4, 3, 2, 1], lambda x: x < 10) == 0
 
 
+def test_search_index() -> None:
+    calls = []
+
+    def small(x: int) -> bool:
+        calls.append(x)
+        return x < 4
+
+    index = SearchIndex([6, 5, 6, 7])
+    assert len(index) == 4
+    assert index.index_of(6) == 0
+    assert index.index_of(3) == -1
+    assert index.find_first(small) == -1
+    assert index.find_first(small) == -1
+    assert calls == [6, 5, 6, 7]
+    index.append(3)
+    index.append(2)
+    assert index.index_of(3) == 4
+    assert index.find_first(small) == 4
+    assert calls == [6, 5, 6, 7, 3]
+
+
+def test_search_index_bounds_its_cache() -> None:
+    index = SearchIndex(range(100), max_predicates=8)
+    for k in range(2000):
+        assert index.find_first(lambda x: x == k % 100) == k % 100
+    assert len(index._found) == 8
+    calls = []
+    index.append(100)
+    keep = (lambda x: calls.append(x) or x > 1000)
+    assert index.find_first(keep) == -1
+    for k in range(20):
+        index.find_first(lambda x: x == k)
+    index.append(2000)
+    assert calls == list(range(101))
+
+
 def test_is_sorted() -> None:
     assert is_sorted([1, 3, 5, 7, 9], (lambda a, b: a > b))
     assert not is_sorted([9, 8, 7, 6, 5, 4, 3, 2, 1], (lambda a, b: a > b))
     assert is_sorted([], (lambda a, b: a > b))
+    assert is_sorted([1], (lambda a, b: a > b))
+    assert not is_sorted([1, 2, 2, 1], (lambda a, b: a > b))
 
 
 def test_partial1() -> None:
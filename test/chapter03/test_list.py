@@ -1,7 +1,7 @@
 from chapter03.list import listOf, sum, product, x, append, foldRight, sum2, product2, tail, setHead, drop, dropWhile, \
     init, init2, length, foldLeft, sum3, product3, reverse, foldRightViaFoldLeft, foldRightViaFoldLeft_1, \
     foldLeftViaFoldRight, appendViaFoldRight, concat, add1, map, map_1, map_2, filter, filter_1, filter_2, flatMap, \
-    filterViaFlatMap, addPairwise, zipWith, startsWith, hasSubsequence
+    filterViaFlatMap, addPairwise, zipWith, startsWith, hasSubsequence, Nil, Cons, fromIterable
 
 
 def test_sum() -> None:
@@ -150,3 +150,18 @@ def test_has_subsequence() -> None:
     assert hasSubsequence(listOf(), listOf())
     assert not hasSubsequence(listOf(1, 2, 3, 4, 5, 6), listOf(6, 7))
     assert not hasSubsequence(listOf(), listOf(6, 7))
+    assert hasSubsequence(listOf(1, 2), listOf())
+    assert hasSubsequence(fromIterable([1] * 5000 + [2]), listOf(1, 1, 2))
+
+
+def test_nodes() -> None:
+    assert Nil() is Nil()
+    assert len(listOf(1, 2, 3)) == 3
+    assert len(Cons(0, listOf(1, 2, 3))) == 4
+    assert len(Nil()) == 0
+
+
+def test_from_iterable() -> None:
+    assert fromIterable(x for x in [1, 2, 3]) == listOf(1, 2, 3)
+    assert len(listOf(*range(100000))) == 100000
+    assert len(map_2(fromIterable(range(10000)), str)) == 10000
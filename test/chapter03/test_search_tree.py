@@ -0,0 +1,55 @@
+import random
+
+from chapter03.search_tree import insert, lookup, itemsBetween, fromSortedItems
+from chapter03.tree import fromSequence, fromIterable, size, depth, fold, Branch, Leaf, map
+
+
+def test_from_sequence() -> None:
+    assert fromSequence([1, 2, 3]) == Branch(Leaf(1), Branch(Leaf(2), Leaf(3)))
+    t = fromIterable(range(1000))
+    assert size(t) == 1999
+    assert depth(t) == 10
+    assert fold(t, lambda a: [a], lambda a, b: a + b) == list(range(1000))
+
+
+def test_insert_and_lookup() -> None:
+    keys = list(range(2000))
+    random.Random(42).shuffle(keys)
+    t = None
+    for k in keys:
+        t = insert(t, k, str(k))
+    assert size(t) == 3999
+    assert depth(t) <= 15
+    assert lookup(t, 1234) == '1234'
+    assert lookup(t, 2000) is None
+    assert lookup(None, 1) is None
+    assert fold(t, lambda kv: [kv[0]], lambda a, b: a + b) == list(range(2000))
+
+
+def test_sorted_inserts_stay_balanced() -> None:
+    t = None
+    for k in range(4096):
+        t = insert(t, k, k)
+    assert depth(t) <= 14
+
+
+def test_persistence() -> None:
+    t1 = fromSortedItems([(1, 'a'), (3, 'c')])
+    t2 = insert(t1, 2, 'b')
+    t3 = insert(t2, 2, 'B')
+    assert lookup(t1, 2) is None
+    assert lookup(t2, 2) == 'b'
+    assert lookup(t3, 2) == 'B'
+    assert size(t3) == size(t2)
+
+
+def test_items_between() -> None:
+    t = fromSortedItems((k, k * k) for k in range(0, 100, 2))
+    assert itemsBetween(t, 10, 17) == [(10, 100), (12, 144), (14, 196), (16, 256)]
+    assert itemsBetween(t, 200, 300) == []
+    assert itemsBetween(None, 0, 1) == []
+
+
+def test_shares_tree_api() -> None:
+    t = fromSortedItems([(1, 1), (2, 2)])
+    assert map(t, lambda kv: (kv[0], kv[1] * 10)) == fromSortedItems([(1, 10), (2, 20)])
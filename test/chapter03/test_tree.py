@@ -1,5 +1,8 @@
 from chapter03.tree import Branch, Leaf, size, maximum, depth, map, fold, sizeViaFold, maximumViaFold, depthViaFold, \
-    mapViaFold
+    mapViaFold, Measure, measure, MAXIMUM, intern_tree, interned_leaf, interned_branch, fromSequence, par_fold, par_map
+import operator
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 tree = Branch(Branch(Leaf(1), Leaf(2)), Leaf(3))
 
@@ -38,3 +41,82 @@ def test_depth_via_fold() -> None:
 
 def test_map_via_fold() -> None:
     assert mapViaFold(tree, str) == Branch(Branch(Leaf('1'), Leaf('2')), Leaf('3'))
+
+
+def test_deep_tree() -> None:
+    deep = Leaf(0)
+    for i in range(1, 20000):
+        deep = Branch(deep, Leaf(i))
+    assert sizeViaFold(deep) == 39999
+    assert size(deep) == 39999
+    assert depth(deep) == 19999
+    assert maximum(deep) == 19999
+    assert maximumViaFold(deep) == 19999
+    assert depthViaFold(deep) == 19999
+    assert fold(map(deep, lambda it: it * 2), lambda a: a, max) == 39998
+    assert fold(mapViaFold(deep, str), lambda a: a, lambda a, b: b) == '19999'
+
+
+def test_cached_metadata() -> None:
+    t = Branch(tree, Branch(Leaf(7), Leaf(4)))
+    assert '_measures' not in vars(t) and '_hash' not in vars(t)
+    assert size(t) == 9
+    assert depth(t) == 3
+    assert maximum(t) == 7
+    assert tree._measures[MAXIMUM] == 3
+
+
+def test_measure() -> None:
+    total = Measure(lambda a: a, lambda a, b: a + b)
+    assert measure(tree, total) == 6
+    rebuilt = Branch(tree.left, Leaf(10))
+    assert measure(rebuilt, total) == 13
+    assert rebuilt.left._measures[total] == 3
+
+
+def test_equality_and_hash() -> None:
+    assert Branch(Branch(Leaf(1), Leaf(2)), Leaf(3)) == tree
+    assert hash(Branch(Branch(Leaf(1), Leaf(2)), Leaf(3))) == hash(tree)
+    assert Branch(Leaf(1), Branch(Leaf(2), Leaf(3))) != tree
+    assert Leaf(1) != Leaf(2)
+    assert Leaf(1) != Branch(Leaf(1), Leaf(1))
+
+
+def test_interning() -> None:
+    t = intern_tree(tree)
+    assert t is intern_tree(Branch(Branch(Leaf(1), Leaf(2)), Leaf(3)))
+    assert t.left is interned_branch(interned_leaf(1), interned_leaf(2))
+    assert t == tree
+    deep = Leaf(0)
+    for i in range(1, 5000):
+        deep = Branch(deep, Leaf(i))
+    assert intern_tree(deep) is intern_tree(deep)
+    assert intern_tree(deep) == deep
+
+
+def test_pickle() -> None:
+    t = Branch(Leaf('a'), Leaf('b'))
+    hash(t), maximum(tree)
+    assert pickle.loads(pickle.dumps(t)) == t
+    assert pickle.loads(pickle.dumps(tree))._measures is None
+
+
+def test_par_fold() -> None:
+    t = fromSequence(range(100))
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert par_fold(t, abs, operator.add, executor=pool, cutoff=3) == 4950
+        assert par_fold(tree, str, operator.add, executor=pool, cutoff=5) == '123'
+        assert par_fold(tree, str, operator.add, executor=pool, cutoff=0) == '123'
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert par_fold(t, str, operator.add, executor=pool, cutoff=2) == ''.join(str(i) for i in range(100))
+        assert par_map(t, abs, executor=pool) == map(t, abs)
+
+
+def test_deep_tree_pickle_and_par_fold() -> None:
+    deep = Leaf(0)
+    for i in range(1, 5000):
+        deep = Branch(deep, Leaf(i))
+    assert pickle.loads(pickle.dumps(deep)) == deep
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert par_fold(deep, abs, operator.add, executor=pool, cutoff=3) == 4999 * 5000 // 2
+        assert par_map(deep, abs, executor=pool, cutoff=3) == deep
@@ -1,12 +1,18 @@
 from typing import TypeVar, Generic
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from unittest import TestCase
 
-from chapter04.either import Right, Left, Try, Either
+from chapter04.either import Right, Left, Try, Either, sequence, traverse, traverse_all, validate_all, try_all
+from common.list import list_of, from_iterable, empty_list
 
 A = TypeVar('A')
 E = TypeVar('E')
 
 
+def not_multiple_of_1000(n: int) -> Either[int, int]:
+    return Left(n) if n % 1000 == 0 else Right(n)
+
+
 class TestEither(TestCase, Generic[E, A]):
     def test_map(self) -> None:
         exception = Exception('Error')
@@ -44,6 +50,58 @@ class TestEither(TestCase, Generic[E, A]):
         left3 = Left(Exception('Blah')).map2(Left(Exception('Newp')), (lambda x, y: x + y))
         self.assertLeft(left3, Exception, 'Blah')
 
+    def test_no_copies(self) -> None:
+        left, right = Left('e'), Right(1)
+        self.assertIs(left, left.map(lambda it: it + 1))
+        self.assertIs(left, left.flat_map(lambda it: Right(it + 1)))
+        self.assertIs(right, right.or_else(lambda: Right(2)))
+        self.assertFalse(hasattr(right, '__dict__'))
+
+    def test_sequence(self) -> None:
+        self.assertEqual(Right(list_of(1, 2)), sequence(list_of(Right(1), Right(2))))
+        self.assertEqual(Left('a'), sequence(list_of(Right(1), Left('a'), Left('b'))))
+        self.assertEqual(Right(empty_list()), sequence(empty_list()))
+
+    def test_traverse(self) -> None:
+        xs = from_iterable(range(10000))
+        self.assertEqual(Right(xs), traverse(xs, Right))
+        seen = []
+        self.assertEqual(Left(3), traverse(xs, lambda it: seen.append(it) or (Left(it) if it == 3 else Right(it))))
+        self.assertEqual([0, 1, 2, 3], seen)
+
+    def test_traverse_all(self) -> None:
+        parse = (lambda it: Right(int(it)) if it.isdigit() else Left(it))
+        self.assertEqual(Right(list_of(1, 2)), traverse_all(list_of('1', '2'), parse))
+        self.assertEqual(Left(list_of((1, 'a'), (3, 'b'))), traverse_all(list_of('1', 'a', '2', 'b'), parse))
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            xs = from_iterable(str(i) if i % 1000 else 'x' for i in range(10000))
+            result = traverse_all(xs, parse, executor=pool)
+            self.assertEqual(Left(from_iterable((i, 'x') for i in range(0, 10000, 1000))), result)
+
+    def test_all_in_chunks(self) -> None:
+        xs = from_iterable(range(10000))
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            self.assertEqual(Right(xs), traverse_all(xs, Right, executor=pool, chunksize=1000))
+            result = validate_all(xs, [not_multiple_of_1000], executor=pool, chunksize=1000)
+            self.assertEqual(Left(from_iterable((i, i) for i in range(0, 10000, 1000))), result)
+
+    def test_validate_all(self) -> None:
+        positive = (lambda it: Right(it) if it > 0 else Left('not positive'))
+        even = (lambda it: Right(it) if it % 2 == 0 else Left('odd'))
+        self.assertEqual(Right(list_of(2, 4)), validate_all(list_of(2, 4), [positive, even]))
+        self.assertEqual(Left(list_of((0, 'odd'), (1, 'not positive'), (1, 'odd'))),
+                         validate_all(list_of(1, -3, 2), [positive, even]))
+
+    def test_try_all(self) -> None:
+        self.assertEqual(Right(list_of(2.0, 1.0)), try_all(list_of(lambda: 2 / 1, lambda: 2 / 2)))
+        result = try_all(list_of(lambda: 2 / 0, lambda: 1, lambda: int('x')))
+        match result:
+            case Left(errors):
+                self.assertEqual([(0, ZeroDivisionError), (2, ValueError)],
+                                 [(i, type(e)) for i, e in errors.to_python()])
+            case _:
+                self.fail()
+
     def assertLeft(self, left: Either[Exception, A], error_type, msg: str) -> None:
         match left:
             case Left(e):
@@ -1,5 +1,5 @@
-from chapter04.option import Some, Nothing, map2, sequenceViaTraverse, traverse, traverse_1, mean
-from common.list import list_of, empty_list
+from chapter04.option import Some, Nothing, map2, sequence, sequenceViaTraverse, traverse, traverse_1, mean, variance
+from common.list import list_of, empty_list, from_iterable
 
 
 def test_Some() -> None:
@@ -50,6 +50,12 @@ def test_mean() -> None:
     assert mean(empty_list()) == Nothing()
 
 
+def test_variance() -> None:
+    assert variance(list_of(2, 4, 4, 4, 5, 5, 7, 9)) == Some(4.0)
+    assert variance(list_of(1.5, 2.5)) == Some(0.25)
+    assert variance(empty_list()) == Nothing()
+
+
 def test_map2() -> None:
     assert map2(Some(1), Some(2), (lambda a, b: a + b)) == Some(3)
     assert map2(Some(1), Nothing(), (lambda a, b: a + b)) == Nothing()
@@ -67,3 +73,26 @@ def test_traverse() -> None:
 def test_traverse_1() -> None:
     xs = traverse_1(list_of(1, 2, 3, 4), lambda it: Some(it / 2.0))
     assert xs == Some(list_of(0.5, 1.0, 1.5, 2.0))
+
+
+def test_sequence() -> None:
+    assert sequence(list_of(Some(1), Some(2))) == Some(list_of(1, 2))
+    assert sequence(list_of(Some(1), Nothing())) == Nothing()
+    assert sequence(empty_list()) == Some(empty_list())
+
+
+def test_traverse_large() -> None:
+    xs = from_iterable(range(10000))
+    assert traverse(xs, Some) == Some(xs)
+    seen = []
+    assert traverse(xs, lambda it: seen.append(it) or (Nothing() if it == 3 else Some(it))) == Nothing()
+    assert seen == [0, 1, 2, 3]
+
+
+def test_no_allocation_on_empty_paths() -> None:
+    assert Nothing() is Nothing()
+    assert Nothing().map(lambda it: it + 1) is Nothing()
+    assert Some(1).filter(lambda it: it > 1) is Nothing()
+    s = Some(5)
+    assert s.orElse(lambda: Some(4)) is s
+    assert not hasattr(s, '__dict__')
@@ -1,3 +1,6 @@
+import math
+import operator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Iterable, Sequence
 
 from Standard import KList, also, let, take_if, take_unless, also_optional
@@ -33,6 +36,13 @@ def test_group_by() -> None:
     assert xs == {0: KList(2, 4, 6, 8, 10), 1: KList(1, 3, 5, 7, 9)}
 
 
+def test_group_reduce() -> None:
+    xs = KList('apple', 'avocado', 'banana', 'cherry', 'blueberry')
+    assert xs.group_reduce(lambda it: it[0], len, (lambda a, b: a + b)) == {'a': 12, 'b': 15, 'c': 6}
+    assert xs.count_by(lambda it: it[0]) == {'a': 2, 'b': 2, 'c': 1}
+    assert KList().count_by(len) == {}
+
+
 def test_size() -> None:
     xs = KList(1, 2, 3, 4, 5)
     assert 5 == xs.size()
@@ -175,3 +185,37 @@ def test_map_filter_flat_map() -> None:
         .filter(lambda it: it % 3 == 0) \
         .flat_map(lambda it: KList(it, it))
     assert expected == actual
+
+
+def test_numeric_reductions() -> None:
+    xs = KList(2, 4, 4, 4, 5, 5, 7, 9)
+    assert xs.sum() == 40
+    assert xs.average() == 5.0
+    assert xs.variance() == 4.0
+    assert xs.min() == 2
+    assert xs.max() == 9
+    assert math.isnan(KList().average())
+
+
+def test_par_map_filter_flat_map() -> None:
+    xs = KList(*range(100))
+    with ThreadPoolExecutor() as pool:
+        assert xs.par_map(lambda it: it * 2, pool, chunks=7) == xs.map(lambda it: it * 2)
+        assert xs.par_filter(lambda it: it % 3 == 0, pool, chunks=7) == xs.filter(lambda it: it % 3 == 0)
+        assert xs.par_flat_map(lambda it: KList(it, it), pool, chunks=7) == xs.flat_map(lambda it: KList(it, it))
+        assert KList().par_map(lambda it: it * 2, pool) == KList()
+
+
+def test_par_fold() -> None:
+    xs = KList(*range(100))
+    with ThreadPoolExecutor() as pool:
+        assert xs.par_fold(0, (lambda acc, it: acc + it), (lambda a, b: a + b), pool, chunks=7) == 4950
+        assert KList().par_fold(0, (lambda acc, it: acc + it), (lambda a, b: a + b), pool) == 0
+
+
+def test_par_with_process_pool() -> None:
+    xs = KList(*range(-50, 50))
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert xs.par_map(abs, executor=pool) == xs.map(abs)
+        assert xs.par_fold(0, operator.add, operator.add, executor=pool, chunks=4) == -50
+    assert xs.par_filter(math.isfinite, chunks=3) == xs
@@ -1,9 +1,16 @@
+import os
+import tempfile
 from unittest import TestCase
 
-from chapter05.stream import stream
+from chapter05.stream import stream, Stream, Cons, empty
+from chapter04.option import Some, Nothing
 from common.list import list_of
 
 
+def count(start: int, stop: int) -> Stream[int]:
+    return Cons(lambda: start, lambda: count(start + 1, stop)) if start < stop else empty()
+
+
 class TestStream(TestCase):
     def test_take(self) -> None:
         xs = stream(1, 2, 3, 4, 5).take(3).to_list()
@@ -40,3 +47,67 @@ class TestStream(TestCase):
 
     def test_flatMap(self) -> None:
         self.assertEqual(list_of(1, 2, 3), stream('1', '2', '3').flat_map(lambda it: stream(int(it))).to_list())
+
+    def test_memoization(self) -> None:
+        calls = []
+        xs = stream(1, 2, 3).map(lambda it: calls.append(it) or it * 10)
+        self.assertTrue(xs.exists(lambda it: it == 30))
+        self.assertEqual(list_of(10, 20, 30), xs.to_list())
+        self.assertEqual([1, 2, 3], calls)
+
+    def test_stack_safety(self) -> None:
+        n = 20000
+        xs = count(0, n)
+        self.assertEqual(n, len(xs.to_list()))
+        self.assertEqual(n - 1, xs.drop(n - 1).head_option().get)
+        self.assertTrue(xs.exists(lambda it: it == n - 1))
+        self.assertTrue(xs.for_all(lambda it: it < n))
+        self.assertEqual(list_of(n - 1), xs.filter(lambda it: it == n - 1).to_list())
+        self.assertEqual(list_of(n - 1), xs.flat_map(lambda it: stream(it) if it == n - 1 else empty()).to_list())
+        self.assertEqual(n, len(xs.map(lambda it: it + 1).take(n).take_while(lambda it: it > 0).to_list()))
+        self.assertEqual(n * (n - 1) // 2, sum(xs))
+        self.assertEqual(n * (n - 1) // 2, xs.fold(0, lambda b, a: b + a))
+        self.assertEqual(n * (n - 1) // 2, xs.fold_right_strict(0, lambda a, b: a + b))
+
+    def test_strict_folds(self) -> None:
+        self.assertEqual('(((z)1)2)3', stream(1, 2, 3).fold('z', lambda b, a: f'({b}){a}'))
+        self.assertEqual('1(2(3(z)))', stream(1, 2, 3).fold_right_strict('z', lambda a, b: f'{a}({b})'))
+        self.assertEqual('z', empty().fold_right_strict('z', lambda a, b: a + b))
+
+    def test_from_iterator(self) -> None:
+        pulled = []
+
+        def source():
+            for i in range(5):
+                pulled.append(i)
+                yield i
+
+        xs = Stream.from_iterator(source())
+        self.assertEqual(list_of(0, 1), xs.take(2).to_list())
+        self.assertEqual([0, 1], pulled)
+        self.assertEqual(list_of(0, 1, 2, 3, 4), xs.to_list())
+        self.assertEqual(list_of(0, 1, 2, 3, 4), xs.to_list())
+        self.assertEqual([0, 1, 2, 3, 4], pulled)
+
+    def test_unfold(self) -> None:
+        xs = Stream.unfold(1, lambda s: Some((s, s * 2)) if s < 20 else Nothing())
+        self.assertEqual(list_of(1, 2, 4, 8, 16), xs.to_list())
+
+    def test_iterate(self) -> None:
+        self.assertEqual(list_of(1, 2, 4, 8), Stream.iterate(1, lambda it: it * 2).take(4).to_list())
+
+    def test_continually(self) -> None:
+        self.assertEqual(list_of(7, 7, 7), Stream.continually(lambda: 7).take(3).to_list())
+
+    def test_range(self) -> None:
+        self.assertEqual(list_of(0, 2, 4), Stream.range(0, 6, 2).to_list())
+        self.assertEqual(10 ** 5 - 1, Stream.range(0, 10 ** 5).drop(10 ** 5 - 1).head_option().get)
+
+    def test_file_sources(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'log.txt')
+            with open(path, 'w') as f:
+                f.write('ok 1\nerror 2\nok 3\n')
+            errors = Stream.from_lines(path).filter(lambda line: line.startswith('error')).to_list()
+            self.assertEqual(list_of('error 2\n'), errors)
+            self.assertEqual(b'ok 1\nerror 2\nok 3\n', b''.join(Stream.from_chunks(path, 4)))
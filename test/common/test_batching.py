@@ -0,0 +1,40 @@
+from concurrent.futures import Executor, Future
+
+from common.batching import batches, merge_batches
+
+
+def test_batches() -> None:
+    assert list(batches(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(batches([], 3)) == []
+
+
+class DeferredFuture(Future):
+    def __init__(self, fn, args) -> None:
+        super().__init__()
+        self.fn, self.args = fn, args
+
+    def result(self, timeout=None):
+        if not self.done():
+            self.set_result(self.fn(*self.args))
+        return super().result(timeout)
+
+
+# Runs each task only when its result is asked for, and records how many tasks were outstanding at each `submit`.
+class DeferredExecutor(Executor):
+    def __init__(self, max_workers: int) -> None:
+        self._max_workers = max_workers
+        self.futures = []
+        self.outstanding = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.outstanding.append(sum(not f.done() for f in self.futures))
+        self.futures.append(DeferredFuture(fn, args))
+        return self.futures[-1]
+
+
+def test_merge_batches() -> None:
+    executor = DeferredExecutor(max_workers=3)
+    results = []
+    merge_batches(iter(range(100)), sum, results.append, 10, executor)
+    assert results == [sum(range(i, i + 10)) for i in range(0, 100, 10)]
+    assert max(executor.outstanding) == 5
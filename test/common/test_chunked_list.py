@@ -0,0 +1,74 @@
+from unittest import TestCase
+
+from common.chunked_list import chunked_list_of, chunked_list_from, chunked_list_from_list
+from common.list import list_of
+
+
+class TestChunkedList(TestCase):
+    def test_empty(self) -> None:
+        self.assertEqual(0, len(chunked_list_of()))
+        self.assertFalse(chunked_list_of())
+
+    def test_head_and_tail(self) -> None:
+        xs = chunked_list_of(1, 2, 3)
+        self.assertEqual(1, xs.head())
+        self.assertEqual(chunked_list_of(2, 3), xs.tail())
+        self.assertEqual(chunked_list_of(), xs.tail().tail().tail())
+        self.assertRaises(Exception, chunked_list_of().tail)
+
+    def test_tail_shares_chunk(self) -> None:
+        xs = chunked_list_of(1, 2, 3)
+        self.assertIs(xs._chunk, xs.tail()._chunk)
+
+    def test_prepend(self) -> None:
+        xs = chunked_list_of(2, 3)
+        self.assertEqual(chunked_list_of(1, 2, 3), xs.prepend(1))
+        self.assertIs(xs, xs.prepend(1).tail())
+
+    def test_length(self) -> None:
+        self.assertEqual(5, len(chunked_list_of(1, 2).append(chunked_list_of(3, 4, 5))))
+
+    def test_fold(self) -> None:
+        self.assertEqual('4321', chunked_list_of(1, 2, 3, 4).fold('', (lambda b, a: f'{a}{b}')))
+
+    def test_fold_right(self) -> None:
+        self.assertEqual('1234', chunked_list_of(1, 2, 3, 4).fold_right('', (lambda a, b: f'{a}{b}')))
+
+    def test_map(self) -> None:
+        self.assertEqual(chunked_list_of(2, 4, 6, 8), chunked_list_of(1, 2, 3, 4).map(lambda x: x * 2))
+
+    def test_filter(self) -> None:
+        self.assertEqual(chunked_list_of(2, 4), chunked_list_of(1, 2, 3, 4).filter(lambda x: x % 2 == 0))
+
+    def test_flat_map(self) -> None:
+        self.assertEqual(chunked_list_of(1, 1, 2, 2), chunked_list_of(1, 2).flat_map(lambda x: chunked_list_of(x, x)))
+
+    def test_append(self) -> None:
+        x = chunked_list_of(1, 2, 3)
+        y = chunked_list_of(4, 5, 6)
+        self.assertEqual(chunked_list_of(1, 2, 3, 4, 5, 6), x.append(y))
+        self.assertIs(y, x.append(y).drop(3))
+
+    def test_reverse(self) -> None:
+        self.assertEqual(chunked_list_of(4, 3, 2, 1), chunked_list_of(1, 2, 3, 4).reverse())
+
+    def test_drop(self) -> None:
+        xs = chunked_list_of(1, 2).append(chunked_list_of(3, 4))
+        self.assertEqual(chunked_list_of(2, 3, 4), xs.drop(1))
+        self.assertEqual(chunked_list_of(4), xs.drop(3))
+        self.assertEqual(chunked_list_of(), xs.drop(10))
+
+    def test_to_string(self) -> None:
+        self.assertEqual('[1, 2, 3, 4]', str(chunked_list_of(1, 2, 3, 4)))
+
+    def test_to_python(self) -> None:
+        self.assertEqual([1, 2, 3, 4], chunked_list_of(1, 2).append(chunked_list_of(3, 4)).to_python())
+
+    def test_conversions(self) -> None:
+        self.assertEqual(list_of(1, 2, 3), chunked_list_of(1, 2, 3).to_list())
+        self.assertEqual(chunked_list_of(1, 2, 3), chunked_list_from_list(list_of(1, 2, 3)))
+
+    def test_large(self) -> None:
+        xs = chunked_list_from(range(100000))
+        self.assertEqual(4999950000, xs.sum())
+        self.assertEqual(99999, xs.drop(99999).head())
@@ -1,6 +1,9 @@
+import copy
+import pickle
 from unittest import TestCase
 
-from common.list import list_of, List, empty_list
+from common.list import list_of, List, empty_list, Nil, from_iterable, from_sequence, ListBuilder, intern_list, \
+    interned_cons
 
 
 class TestList(TestCase):
@@ -83,6 +86,14 @@ class TestList(TestCase):
         assert list_of(1, 2, 3, 4, 5).has_subsequence(list_of(5))
         assert not list_of(1, 2, 3, 4, 5).has_subsequence(list_of(0))
         assert not list_of(1, 2, 3, 4, 5).has_subsequence(list_of(5, 6))
+        assert list_of(1, 2).has_subsequence(empty_list())
+        assert from_iterable([1] * 10000 + [2]).has_subsequence(list_of(1, 1, 2))
+
+    def test_find_subsequences(self) -> None:
+        xs = list_of('a', 'b', 'a', 'b', 'c')
+        found = xs.find_subsequences(list_of('a', 'b'), list_of('b', 'a', 'b'), list_of('b', 'c'), list_of('x'))
+        self.assertEqual(list_of((0, 0), (1, 1), (2, 0), (3, 2)), found)
+        self.assertEqual(empty_list(), xs.find_subsequences())
 
     def test_map_filter_flatMap(self) -> None:
         expected: List[int] = list_of(6, 6, 12, 12)
@@ -96,3 +107,73 @@ class TestList(TestCase):
         actual = list_of(1, 2, 3, 4, 5, 6, 7, 8, 9, 10).group_by(lambda it: it % 2)
         expected = {0: list_of(2, 4, 6, 8, 10), 1: list_of(1, 3, 5, 7, 9)}
         assert expected == actual
+
+    def test_stack_safe_non_tail_recursion(self) -> None:
+        xs = from_iterable(range(10000))
+        self.assertEqual(49995000, xs.fold_right(0, (lambda a, b: a + b)))
+        self.assertEqual(list(range(1, 10001)), xs.map(lambda x: x + 1).to_python())
+        self.assertEqual(list(range(9999)), xs.init().to_python())
+        self.assertEqual(list(range(0, 20000, 2)), xs.zip_with(xs, (lambda a, b: a + b)).to_python())
+
+    def test_nodes(self) -> None:
+        xs = list_of(1, 2, 3)
+        self.assertIs(Nil(), empty_list())
+        self.assertIs(Nil(), xs.drop(3))
+        self.assertFalse(hasattr(xs, '__dict__'))
+        self.assertEqual(2, len(xs.tail()))
+        self.assertEqual(10000, len(from_iterable(range(10000))))
+
+    def test_builders(self) -> None:
+        self.assertEqual(list_of(1, 2, 3), from_sequence([1, 2, 3]))
+        self.assertEqual(list_of(1, 2, 3), from_iterable(x for x in [1, 2, 3]))
+        self.assertIs(Nil(), from_iterable([]))
+        self.assertEqual(list_of(1, 2, 3, 4), ListBuilder().append(1).extend([2, 3]).append(4).result())
+        self.assertEqual(100000, len(list_of(*range(100000))))
+
+    def test_view(self) -> None:
+        xs = list_of(1, 2, 3, 4, 5, 6, 7, 8)
+        view = xs.view().map(lambda it: it * 2).filter(lambda it: it % 3 == 0).flat_map(lambda it: list_of(it, it))
+        self.assertEqual(list_of(6, 6, 12, 12), view.to_list())
+        self.assertEqual([6, 6, 12, 12], view.to_python())
+        self.assertEqual(36, view.sum())
+        self.assertEqual(36, view.fold(0, (lambda b, a: a + b)))
+        self.assertEqual([2, 3], xs.view().drop(1).take(2).to_python())
+        self.assertEqual([3, 4], xs.view().drop_while(lambda it: it < 3).take_while(lambda it: it < 5).to_python())
+        self.assertEqual({0: list_of(2, 4), 1: list_of(1, 3)}, xs.view().take(4).group_by(lambda it: it % 2))
+
+    def test_view_is_lazy(self) -> None:
+        seen = []
+        view = list_of(1, 2, 3, 4).view().map(lambda it: seen.append(it) or it).take(2)
+        self.assertEqual([], seen)
+        self.assertEqual([1, 2], view.to_python())
+        self.assertEqual([1, 2], seen)
+
+    def test_equality_and_hash(self) -> None:
+        xs = from_iterable(range(10000))
+        ys = from_iterable(range(10000))
+        self.assertEqual(xs, ys)
+        self.assertEqual(hash(xs), hash(ys))
+        self.assertNotEqual(xs, from_iterable(range(1, 10001)))
+        self.assertNotEqual(list_of(1, 2), list_of(1, 2, 3))
+        self.assertNotEqual(list_of(1), empty_list())
+
+    def test_pickle_and_copy(self) -> None:
+        xs = list_of(1, 'a', (2, 3))
+        for ys in (xs, from_iterable(range(10000))):
+            self.assertEqual(ys, pickle.loads(pickle.dumps(ys)))
+            self.assertEqual(ys, copy.copy(ys))
+            self.assertEqual(ys, copy.deepcopy(ys))
+        hash(xs)
+        self.assertEqual(xs, pickle.loads(pickle.dumps(xs)))
+        self.assertIs(Nil(), pickle.loads(pickle.dumps(Nil())))
+
+    def test_interning(self) -> None:
+        xs = intern_list(list_of(1, 2, 3))
+        ys = intern_list(list_of(0, 2, 3))
+        self.assertIs(xs, intern_list(list_of(1, 2, 3)))
+        self.assertIs(xs.tail(), ys.tail())
+        self.assertIs(xs, interned_cons(1, interned_cons(2, interned_cons(3, Nil()))))
+        self.assertIsNot(interned_cons(1, Nil()), interned_cons(True, Nil()))
+        self.assertEqual(list_of(1, 2, 3), xs)
+        self.assertEqual(repr(list_of(1, 2, 3)), repr(xs))
+        self.assertFalse(hasattr(list_of(1), '__weakref__'))
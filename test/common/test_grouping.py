@@ -0,0 +1,39 @@
+import operator
+from concurrent.futures import ProcessPoolExecutor
+
+from chapter05.stream import Stream
+from common.grouping import group_by, group_reduce, count_by, group_reduce_spilling, par_group_reduce
+from common.list import list_of
+
+rows = [('a', 1), ('b', 2), ('a', 3), ('c', 4), ('b', 5)]
+first, second = operator.itemgetter(0), operator.itemgetter(1)
+
+
+def test_group_by() -> None:
+    assert group_by(range(7), lambda it: it % 3) == {0: [0, 3, 6], 1: [1, 4], 2: [2, 5]}
+    assert group_by(list_of('x', 'yy', 'z'), len) == {1: ['x', 'z'], 2: ['yy']}
+    assert group_by([], len) == {}
+
+
+def test_group_reduce() -> None:
+    assert group_reduce(rows, first, second, operator.add) == {'a': 4, 'b': 7, 'c': 4}
+    assert group_reduce(iter(rows), first, second, max) == {'a': 3, 'b': 5, 'c': 4}
+
+
+def test_count_by() -> None:
+    assert count_by(Stream.range(0, 10), lambda it: it % 2 == 0) == {True: 5, False: 5}
+
+
+def test_group_reduce_spilling() -> None:
+    xs = [(i % 1000, 1) for i in range(10000)]
+    expected = group_reduce(xs, first, second, operator.add)
+    assert dict(group_reduce_spilling(xs, first, second, operator.add, max_keys=100, partitions=4)) == expected
+    assert dict(group_reduce_spilling(xs, first, second, operator.add)) == expected
+    assert list(group_reduce_spilling([], first, second, operator.add, max_keys=1)) == []
+
+
+def test_par_group_reduce() -> None:
+    xs = [(i % 13, i) for i in range(5000)]
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        result = par_group_reduce(xs, first, second, operator.add, batch_size=300, executor=pool)
+    assert result == group_reduce(xs, first, second, operator.add)
@@ -0,0 +1,26 @@
+from common.matching import find, contains, MultiPatternMatcher
+
+
+def test_find() -> None:
+    assert list(find([1, 1, 1, 2, 1, 1, 2], (1, 1, 2))) == [1, 4]
+    assert list(find('aaaa', 'aa')) == [0, 1, 2]
+    assert list(find(iter([1, 2]), ())) == [0, 1, 2]
+    assert list(find([], (1,))) == []
+
+
+def test_find_unhashable() -> None:
+    assert list(find([[1], [2], [1], [2]], ([1], [2]))) == [0, 2]
+
+
+def test_contains() -> None:
+    assert contains(range(10), (3, 4, 5))
+    assert not contains(range(10), (5, 4))
+    assert contains([], ())
+
+
+def test_multi_pattern_matcher() -> None:
+    matcher = MultiPatternMatcher(['he', 'she', 'his', 'hers'])
+    assert len(matcher) == 4
+    assert list(matcher.find('ushers')) == [(1, 1), (2, 0), (2, 3)]
+    assert list(MultiPatternMatcher(['a', '']).find('aa')) == [(0, 1), (0, 0), (1, 1), (1, 0), (2, 1)]
+    assert list(MultiPatternMatcher([]).find('abc')) == []
@@ -0,0 +1,30 @@
+from decimal import Decimal
+from fractions import Fraction
+
+from common.list import list_of
+from common.numeric import mean, variance, to_decimal_string
+
+
+def test_mean() -> None:
+    assert mean([1, 2, 3]) == 2.0
+    assert mean(x for x in [1.0, 2.0]) == 1.5
+
+
+def test_variance() -> None:
+    assert variance([2, 4, 4, 4, 5, 5, 7, 9]) == 4.0
+    assert variance([2, 4, 4, 4, 5, 5, 7, 9], 5.0) == 4.0
+    assert variance(iter([1.0, 3.0])) == 1.0
+    assert variance(list_of(2, 4, 4, 4, 5, 5, 7, 9)) == 4.0
+
+
+def test_non_float_numbers() -> None:
+    assert variance([Fraction(1), Fraction(2)]) == Fraction(1, 4)
+    assert variance([Decimal('1.5'), Decimal('2.5')]) == Decimal('0.25')
+
+
+def test_to_decimal_string() -> None:
+    assert to_decimal_string(0) == '0'
+    assert to_decimal_string(-12) == '-12'
+    n = 7 ** 20000
+    assert to_decimal_string(n) == str(Decimal(n))
+    assert to_decimal_string(-n) == '-' + str(Decimal(n))
@@ -0,0 +1,36 @@
+from common.tail_call import Return, Suspend, TailCall, tailrec
+
+
+def test_eval() -> None:
+    def go(n: int, acc: int) -> TailCall[int]:
+        return Return(acc) if n == 0 else Suspend(lambda: go(n - 1, acc + n))
+
+    assert go(10000, 0).eval() == 50005000
+
+
+def test_tailrec() -> None:
+    @tailrec
+    def go(n: int, acc: int) -> Return[int] | tuple:
+        return Return(acc) if n == 0 else (n - 1, acc + n)
+
+    assert go(10000, 0) == 50005000
+    assert go(0, 7) == 7
+
+
+def test_tailrec_returns_tuples() -> None:
+    @tailrec
+    def go(n: int) -> Return[tuple] | tuple:
+        return Return((n, n)) if n == 0 else (n - 1,)
+
+    assert go(3) == (0, 0)
+
+
+def test_flat_map() -> None:
+    def sum_to(n: int) -> TailCall[int]:
+        return Return(0) if n == 0 else Suspend(lambda: sum_to(n - 1)).flat_map(lambda s: Return(s + n))
+
+    assert sum_to(10000).eval() == 50005000
+
+
+def test_map() -> None:
+    assert Return(2).map(lambda x: x + 1).map(str).eval() == '3'